@@ -1,33 +1,109 @@
 from datetime import datetime
 from timeslot import *
-def generate_timeslots(start_date, end_date, daily_slots):
+import numpy as np
+
+# Default daily slot pattern (start, end)
+DEFAULT_TIME_PAIRS = [
+    ("09:00", "11:00"),
+    ("12:00", "02:00"),
+    ("15:00", "17:00"),
+]
+
+def generate_timeslots(start_date, end_date, daily_slots, time_pairs=None, skip_weekdays=(4, 5)):
     timeslots = []
     timeslot_id = 1
     current_date = start_date
-    
-    time_pairs = [
-        ("09:00", "11:00"),
-        ("12:00", "02:00"),
-        ("15:00", "17:00"),
-    ]
-    
+
+    time_pairs = time_pairs if time_pairs is not None else DEFAULT_TIME_PAIRS
+
     while current_date <= end_date:
-        # Skip weekends (Friday and Saturday)
-        if current_date.weekday() not in [4, 5]:  # 4 = Friday, 5 = Saturday
+        # Skip weekends (Friday and Saturday by default)
+        if current_date.weekday() not in skip_weekdays:  # 4 = Friday, 5 = Saturday
             for i in range(min(daily_slots, len(time_pairs))):
                 start_time, end_time = time_pairs[i]
                 timeslots.append(
                     Timeslot(timeslot_id, current_date, start_time, end_time)
                 )
                 timeslot_id += 1
-        
+
         current_date += timedelta(days=1)
-    
+
     return timeslots
 
-# ==== Define Exam Period ====
+
+class Calendar:
+    """Exam period: its timeslots plus precomputed per-slot columns.
+
+    Built from a date range and a daily slot pattern (or from an existing
+    list of timeslots).  Behaves like the list of Timeslot objects (len,
+    indexing, iteration) and adds, per slot index, ``day_index`` (0-based
+    exam day), ``slot_in_day``, ``weekend`` (Saturday/Sunday, as the
+    fitness function defines it) and the cached ``date_strs``, plus
+    ``day_slots``: the slot indices of each day in timeslot id order.
+    """
+
+    def __init__(self, start_date=datetime(2025, 5, 19), end_date=datetime(2025, 6, 4), daily_slots=3,
+                 time_pairs=None, skip_weekdays=(4, 5), timeslots=None):
+        if timeslots is None:
+            timeslots = generate_timeslots(start_date, end_date, daily_slots, time_pairs, skip_weekdays)
+        self.timeslots = list(timeslots)
+
+        self.slot_ids = np.array([ts.timeslot_id for ts in self.timeslots], dtype=np.int64)
+        self.slot_index = {ts.timeslot_id: i for i, ts in enumerate(self.timeslots)}
+        self.date_strs = [ts.date_str for ts in self.timeslots]
+        self.day_names = [ts.day for ts in self.timeslots]
+        self.weekend = np.array([ts.date.weekday() >= 5 for ts in self.timeslots], dtype=bool)
+
+        # Days in order of first appearance, slots of a day sorted by timeslot id
+        day_of = {}
+        for date_str in self.date_strs:
+            day_of.setdefault(date_str, len(day_of))
+        self.day_index = np.array([day_of[d] for d in self.date_strs], dtype=np.int64)
+        self.day_dates = list(day_of)
+        self.day_slots = [[] for _ in day_of]
+        for i in sorted(range(len(self.timeslots)), key=lambda i: self.timeslots[i].timeslot_id):
+            self.day_slots[self.day_index[i]].append(i)
+        self.slot_in_day = np.zeros(len(self.timeslots), dtype=np.int64)
+        for slots in self.day_slots:
+            self.slot_in_day[slots] = np.arange(len(slots))
+
+    @classmethod
+    def from_timeslots(cls, timeslots):
+        """Calendar over an existing list of timeslots (or a Calendar, returned as-is)"""
+        if isinstance(timeslots, Calendar):
+            return timeslots
+        return cls(timeslots=timeslots)
+
+    @property
+    def num_days(self):
+        return len(self.day_slots)
+
+    def __len__(self):
+        return len(self.timeslots)
+
+    def __getitem__(self, index):
+        return self.timeslots[index]
+
+    def __iter__(self):
+        return iter(self.timeslots)
+
+
+# ==== Default Exam Period ====
 start_date = datetime(2025, 5, 19)
 end_date = datetime(2025, 6, 4)
 daily_slots = 3
-# ==== Generate Timeslots ====
-timeslots = generate_timeslots(start_date, end_date, daily_slots)
+
+_default_calendar = None
+
+def default_calendar():
+    """Calendar for the default exam period, built on first use"""
+    global _default_calendar
+    if _default_calendar is None:
+        _default_calendar = Calendar(start_date, end_date, daily_slots)
+    return _default_calendar
+
+def __getattr__(name):
+    # Legacy ``from Time_Slots import timeslots``: generated lazily instead of at import
+    if name == 'timeslots':
+        return default_calendar().timeslots
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,273 @@
+import math
+import random
+
+import numpy as np
+
+from anytime import Budget, Progress, drive
+from fitness import IncrementalEvaluator
+from instrumentation import count, timer
+from seeding import Seeder
+from solver import Solver
+
+
+class SimulatedAnnealing(Solver):
+    """Single-solution simulated annealing on the GA/ACO penalty function.
+
+    Starts from a DSatur seed (``seeding.Seeder``) and, at every
+    temperature, tries ``moves_per_temperature`` random neighbours, drawn
+    according to ``move_weights``:
+
+    - 'move': one exam to another same-day timeslot window, with the
+      least-waste free room set there (``RoomPacker``)
+    - 'kempe': a Kempe-chain swap; the exams occupying timeslot ``a`` or
+      ``b`` that are linked to a random exam through shared students
+      exchange the two start slots, so no new clash appears in ``a`` or
+      ``b`` inside the chain
+    - 'room_swap': two exams exchange their room sets (an exam move when
+      there is only one exam)
+
+    Moves are scored incrementally by an ``IncrementalEvaluator`` holding
+    the current timetable; worse moves are accepted with probability
+    exp(-delta / temperature).  The temperature starts at
+    ``initial_temperature`` (estimated from sampled uphill moves when
+    None), falls by ``cooling_rate`` per iteration and is reset to the
+    start value (reheating) once it drops below ``min_temperature``.  Both
+    temperatures must be positive.
+    """
+
+    def __init__(self, students=None, exams=None, rooms=None, time_slots=None, instance=None):
+        super().__init__(students, exams, rooms, time_slots, instance)
+
+        # Annealing parameters
+        self.initial_temperature = None  # None: estimated from sampled moves
+        self.cooling_rate = 0.95
+        self.min_temperature = 0.05
+        self.moves_per_temperature = 200
+        self.move_weights = {'move': 0.5, 'kempe': 0.3, 'room_swap': 0.2}
+
+        # DSatur seeder, also the source of the timeslot windows per exam length
+        self.seeder = Seeder(self.fitness_engine)
+        self._window_at = {
+            length: {int(window[0]): window.tolist() for window in windows}
+            for length, windows in self.seeder.windows.items()
+        }
+
+    @property
+    def initial_temperature(self):
+        return self._initial_temperature
+
+    @initial_temperature.setter
+    def initial_temperature(self, value):
+        if value is not None and value <= 0:
+            raise ValueError(f"initial_temperature must be positive, got {value}")
+        self._initial_temperature = value
+
+    @property
+    def min_temperature(self):
+        return self._min_temperature
+
+    @min_temperature.setter
+    def min_temperature(self, value):
+        if value <= 0:
+            raise ValueError(f"min_temperature must be positive, got {value}")
+        self._min_temperature = value
+
+    def run_annealing(self, max_iterations=100, initial=None, time_limit=None, stagnation_limit=None,
+                      callback=None):
+        """Anneal from ``initial`` (a Genome; default a DSatur seed); returns
+        ``(best_encoded, iteration, best_decoded)``.
+
+        An iteration is ``moves_per_temperature`` moves at one temperature.
+        Stops after ``max_iterations``, after ``time_limit`` seconds or
+        ``stagnation_limit`` iterations without improvement, or when
+        ``callback(progress)`` (called on every improvement) returns True.
+        """
+        progress = drive(self.run_annealing_steps(max_iterations, initial, time_limit, stagnation_limit),
+                         callback)
+        return self._finish(progress.best, progress.step)
+
+    def run_annealing_steps(self, max_iterations=100, initial=None, time_limit=None, stagnation_limit=None):
+        """Generator form of run_annealing: yields a ``Progress`` after every
+        temperature.  Closing it stops the run."""
+        budget = Budget(time_limit, stagnation_limit)
+        current = initial.copy() if initial is not None else self.seeder.genome()
+        evaluator = IncrementalEvaluator(self.fitness_engine).load_genome(current)
+        current_fitness = evaluator.fitness
+        best, best_fitness = current.copy(), current_fitness
+
+        temperature = self.initial_temperature
+        if temperature is None:
+            temperature = self.estimate_temperature(evaluator, current)
+        start_temperature = temperature
+        print(f"Starting simulated annealing at fitness {current_fitness} (temperature {temperature:.2f})")
+
+        kinds = list(self.move_weights)
+        weights = [self.move_weights[kind] for kind in kinds]
+        for iteration in range(max_iterations):
+            count('sa.iterations')
+            accepted = 0
+            with timer('sa.moves'):
+                for kind in random.choices(kinds, weights=weights, k=self.moves_per_temperature):
+                    moves = self.neighbour(kind, evaluator, current)
+                    if not moves:
+                        continue
+                    if len(moves) == 1:
+                        # Single exam moves are scored without changing the state
+                        change, undo = evaluator.delta(*moves[0]), None
+                    else:
+                        change, undo = self.apply(evaluator, moves)
+                    if change <= 0 or random.random() < math.exp(-change / temperature):
+                        accepted += 1
+                        if undo is None:
+                            evaluator.move(*moves[0])
+                        for exam, slots, rooms in moves:
+                            current.set_slots(exam, slots[0], len(slots))
+                            current.set_rooms(exam, rooms)
+                        current_fitness -= change
+                        if current_fitness > best_fitness:
+                            # Exact fitness, free of accumulated rounding
+                            current_fitness = evaluator.fitness
+                            if current_fitness > best_fitness:
+                                best, best_fitness = current.copy(), current_fitness
+                    elif undo is not None:
+                        self.apply(evaluator, undo)
+            count('sa.moves', self.moves_per_temperature)
+            count('sa.accepted', accepted)
+
+            print(f"Iteration {iteration + 1}: Fitness = {current_fitness}, Best = {best_fitness}, "
+                  f"Temperature = {temperature:.3f}")
+
+            improved = budget.update(best_fitness)
+            yield Progress(iteration, best, best_fitness, improved, budget.elapsed)
+
+            temperature *= self.cooling_rate
+            if temperature < self.min_temperature:
+                temperature = start_temperature
+
+            reason = budget.exhausted()
+            if reason:
+                print(f"Stopping early: {reason}")
+                break
+
+    def estimate_temperature(self, evaluator, current, samples=100):
+        """Start temperature at which the median uphill move is accepted
+        with probability 1/2"""
+        uphill = []
+        kinds = list(self.move_weights)
+        for kind in random.choices(kinds, weights=[self.move_weights[k] for k in kinds], k=samples):
+            moves = self.neighbour(kind, evaluator, current)
+            if moves:
+                change, undo = self.apply(evaluator, moves)
+                self.apply(evaluator, undo)
+                if change > 0:
+                    uphill.append(change)
+        if not uphill:
+            return 1.0
+        return float(np.median(uphill)) / math.log(2)
+
+    def apply(self, evaluator, moves):
+        """Make ``moves`` (``(exam, slots, rooms)`` tuples) on ``evaluator``;
+        returns the total penalty change and the moves that undo them"""
+        change = 0
+        undo = []
+        for exam, slots, rooms in moves:
+            undo.append((exam, evaluator.slots[exam], evaluator.rooms[exam]))
+            change += evaluator.move(exam, slots, rooms)
+        return change, undo[::-1]
+
+    def neighbour(self, kind, evaluator, current):
+        """A random neighbour of ``kind`` as a list of ``(exam, slots, rooms)``
+        moves, or None if the drawn move does not apply"""
+        if not self.instance.num_exams:
+            return None
+        if kind == 'move':
+            return self.exam_move(evaluator, current)
+        if kind == 'kempe':
+            return self.kempe_move(current)
+        if kind == 'room_swap':
+            if self.instance.num_exams < 2:
+                # Nothing to swap rooms with: move the exam instead
+                return self.exam_move(evaluator, current)
+            return self.room_swap(current)
+        raise ValueError(f"Unknown move: {kind}")
+
+    def exam_move(self, evaluator, current):
+        """One exam to a random other window, in a least-waste free room set"""
+        exam = random.randrange(self.instance.num_exams)
+        windows = self.seeder.windows[int(self.seeder.required[exam])]
+        slots = windows[random.randrange(len(windows))].tolist()
+        old_slots, old_rooms = current.placement(exam)
+        if slots == old_slots:
+            return None
+
+        # Rooms booked in the new window by other exams
+        load = evaluator.room_load.reshape(len(self.time_slots), self.instance.num_rooms)[slots]
+        for row, slot in enumerate(slots):
+            if slot in old_slots:
+                load[row, old_rooms] -= 1
+        options = self.fitness_engine.room_packer.options(
+            self.instance.enrollment[exam], 3, (load > 0).any(axis=0))
+        return [(exam, slots, random.choice(options))]
+
+    def kempe_move(self, current):
+        """Kempe-chain swap of the exams occupying two timeslots.
+
+        The chain is every exam in timeslot ``a`` or ``b`` linked to the
+        drawn exam through shared students.  Chains with an exam that covers
+        ``a`` or ``b`` without starting there cannot be swapped, so the move
+        does not apply; exams longer than one slot may still clash in their
+        other slots, which the move's penalty change includes.
+        """
+        exam = random.randrange(self.instance.num_exams)
+        start = current.start
+        a = int(start[exam])
+        starts = self._window_at[int(self.seeder.required[exam])]
+        b = random.choice(list(starts))
+        if b == a or current.length[exam] == 0:
+            return None
+
+        # Exams in a or b, connected to ``exam`` by shared students
+        neighbours = self.fitness_engine.conflict_graph.neighbours
+        end = start + current.length
+        in_chain = {exam}
+        frontier = [exam]
+        while frontier:
+            linked = neighbours[frontier.pop()]
+            first, last = start[linked], end[linked]
+            occupying = ((first <= a) & (a < last)) | ((first <= b) & (b < last))
+            for other in linked[occupying].tolist():
+                if other not in in_chain:
+                    in_chain.add(other)
+                    frontier.append(other)
+
+        moves = []
+        for other in in_chain:
+            if start[other] != a and start[other] != b:
+                return None
+            new_start = b if start[other] == a else a
+            slots = self._window_at[int(self.seeder.required[other])].get(new_start)
+            if slots is None:
+                return None
+            moves.append((other, slots, current.room_list(other)))
+        return moves
+
+    def room_swap(self, current):
+        """Two exams exchange their room sets"""
+        first, second = random.sample(range(self.instance.num_exams), 2)
+        first_slots, first_rooms = current.placement(first)
+        second_slots, second_rooms = current.placement(second)
+        if not first_slots or not second_slots or first_rooms == second_rooms:
+            return None
+        return [(first, first_slots, second_rooms), (second, second_slots, first_rooms)]
+
+    def _finish(self, best, iteration):
+        """Final report of a run; returns ``(best_encoded, iteration, best_decoded)``"""
+        best_decoded = best.decode(self.exams, self.rooms, self.time_slots)
+        fitness = self.record_conflicts(self.fitness_cache.report(best, best_decoded))
+        print(f"Final best fitness: {fitness}")
+
+        # Print conflict report
+        self.print_conflict_report()
+
+        # Return the solution in the legacy string encoding
+        return best.to_encoded(), iteration, best_decoded
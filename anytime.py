@@ -0,0 +1,72 @@
+"""Anytime solving: wall-clock budgets, stagnation limits and progress.
+
+Every solver loop is also available as a generator (``*_steps``) that
+yields a ``Progress`` after each generation/iteration, so a caller can
+stop whenever it likes and keep the best timetable found so far:
+
+    for progress in ga.genetic_algorithm_steps(population, 500, 0, time_limit=30):
+        if progress.improved:
+            print(progress.step, progress.fitness)
+
+The regular entry points (``genetic_algorithm``, ``run_aco``, ...) take the
+same ``time_limit``/``stagnation_limit`` and an optional ``callback``
+called with each improving ``Progress``; returning True from it stops
+the run.
+"""
+import time
+from collections import namedtuple
+
+# ``step`` is the generation (GA) or iteration (ACO) just completed, ``best``
+# the best Genome so far, ``improved`` whether this step found it and
+# ``elapsed`` the seconds since the run started
+Progress = namedtuple('Progress', ['step', 'best', 'fitness', 'improved', 'elapsed'])
+
+
+class Budget:
+    """Stopping rules of one run: an optional wall-clock ``time_limit`` in
+    seconds and an optional ``stagnation_limit``, the number of steps
+    without improvement after which the run stops."""
+
+    def __init__(self, time_limit=None, stagnation_limit=None):
+        self.time_limit = time_limit
+        self.stagnation_limit = stagnation_limit
+        self.started = time.perf_counter()
+        self.best_fitness = float('-inf')
+        self.stagnant = 0
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def update(self, best_fitness, steps=1):
+        """Record ``steps`` more steps ending at ``best_fitness``; returns
+        whether it improved on the previous best"""
+        if best_fitness > self.best_fitness:
+            self.best_fitness = best_fitness
+            self.stagnant = 0
+            return True
+        self.stagnant += steps
+        return False
+
+    def exhausted(self):
+        """Reason to stop (a message), or None to keep going"""
+        if self.time_limit is not None and self.elapsed >= self.time_limit:
+            return f"time limit of {self.time_limit:g} s reached"
+        if self.stagnation_limit is not None and self.stagnant >= self.stagnation_limit:
+            return f"no improvement for {self.stagnant} steps"
+        return None
+
+
+def drive(steps, callback=None):
+    """Run a ``*_steps`` generator to the end, or until ``callback`` returns
+    True for an improving step; returns the last Progress (None if no
+    step ran)."""
+    progress = None
+    try:
+        for progress in steps:
+            if callback is not None and progress.improved and callback(progress):
+                print(f"Stopped by callback at step {progress.step}")
+                break
+    finally:
+        steps.close()
+    return progress
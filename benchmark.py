@@ -0,0 +1,239 @@
+"""Benchmark harness for the timetabling solvers.
+
+Generates synthetic instances in the exams.csv/students.csv/rooms.csv
+schema and times decoding, fitness evaluation, GA generations and ACO
+iterations across instance sizes. Results are written as JSON and CSV so
+regressions can be tracked from run to run.
+
+    python benchmark.py --sizes 22x1000x25 100x5000x40 --days 15 --output bench
+"""
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import platform
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from Time_Slots import Calendar
+from aco import ACO
+from data import Data
+from encoder import decode_individual
+from genetic import GeneticAlgorithm
+
+ENROLLMENT_DISTRIBUTIONS = ('uniform', 'normal', 'zipf')
+ROOM_CAPACITIES = (20, 25, 30, 40, 50, 75, 100, 125, 150, 190, 200)
+
+
+def generate_instance(directory, num_exams, num_students, num_rooms, enrollment='uniform',
+                      mean_enrollment=None, long_exam_ratio=0.0, seed=0):
+    """Write a synthetic exams.csv/students.csv/rooms.csv into ``directory``.
+
+    ``enrollment`` chooses how exam sizes are drawn around
+    ``mean_enrollment`` (default: about four exams per student):
+    'uniform' (between half and one and a half times the mean), 'normal'
+    (standard deviation of a quarter of the mean) or 'zipf' (a few very
+    large exams and a long tail of small ones). ``long_exam_ratio`` is the
+    share of 240 minute exams, the rest last 120 minutes.
+    """
+    if enrollment not in ENROLLMENT_DISTRIBUTIONS:
+        raise ValueError(f"Unknown enrollment distribution: {enrollment}")
+    rng = random.Random(seed)
+    if mean_enrollment is None:
+        mean_enrollment = max(1, num_students * 4 // max(1, num_exams))
+
+    if enrollment == 'uniform':
+        sizes = [rng.randint(max(1, mean_enrollment // 2), max(1, mean_enrollment * 3 // 2))
+                 for _ in range(num_exams)]
+    elif enrollment == 'normal':
+        sizes = [round(rng.gauss(mean_enrollment, mean_enrollment / 4)) for _ in range(num_exams)]
+    else:
+        weights = [1 / (rank + 1) for rank in range(num_exams)]
+        scale = mean_enrollment * num_exams / sum(weights)
+        sizes = [round(w * scale) for w in weights]
+        rng.shuffle(sizes)
+    sizes = [min(num_students, max(1, size)) for size in sizes]
+
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, 'students.csv'), 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['id', 'name'])
+        for student_id in range(1, num_students + 1):
+            writer.writerow([student_id, f"Student-{student_id}"])
+
+    with open(os.path.join(directory, 'rooms.csv'), 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['id', 'room_name', 'capacity'])
+        for room_id in range(1, num_rooms + 1):
+            writer.writerow([room_id, f"Room-{room_id}", rng.choice(ROOM_CAPACITIES)])
+
+    with open(os.path.join(directory, 'exams.csv'), 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['id', 'course_name', 'duration', 'student_ids', 'priority'])
+        for exam_id, size in enumerate(sizes, start=1):
+            student_ids = sorted(rng.sample(range(1, num_students + 1), size))
+            duration = 240 if rng.random() < long_exam_ratio else 120
+            writer.writerow([exam_id, f"Course {exam_id}", duration,
+                             ';'.join(map(str, student_ids)), rng.randint(1, 5)])
+    return directory
+
+
+def generate_calendar(num_days, daily_slots=3, start_date=datetime(2025, 5, 19)):
+    """Calendar covering ``num_days`` exam days (Fridays and Saturdays are skipped)"""
+    end_date = start_date
+    exam_days = 0
+    while True:
+        if end_date.weekday() not in [4, 5]:
+            exam_days += 1
+        if exam_days >= num_days:
+            break
+        end_date += timedelta(days=1)
+    return Calendar(start_date, end_date, daily_slots)
+
+
+def load_instance(directory):
+    """Columnar instance read from the CSV files in ``directory``"""
+    return Data.load_instance(
+        os.path.join(directory, 'students.csv'),
+        os.path.join(directory, 'exams.csv'),
+        os.path.join(directory, 'rooms.csv'),
+    )
+
+
+def time_call(function, repeats):
+    """Run ``function`` ``repeats`` times; returns timing statistics in seconds"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return {
+        'repeats': repeats,
+        'mean_s': sum(timings) / len(timings),
+        'min_s': min(timings),
+        'max_s': max(timings),
+    }
+
+
+def benchmark_instance(instance, time_slots, repeats=5, population_size=20,
+                       ga_generations=5, aco_iterations=2, num_ants=5, local_search_iterations=5,
+                       seed=0):
+    """Time every stage on one instance; returns a list of result dicts"""
+    random.seed(seed)
+    data = {'instance': instance, 'time_slots': time_slots}
+    exams, rooms = instance.exams, instance.rooms
+    results = []
+
+    def record(stage, stats, per=1):
+        # ``per`` converts whole-run timings into per-generation/iteration ones
+        results.append({'stage': stage, **{k: (v / per if k != 'repeats' else v) for k, v in stats.items()}})
+
+    ga = GeneticAlgorithm(**data)
+    population = ga.generate_population(population_size=population_size)
+    encoded = population[0].to_encoded()
+    decoded = decode_individual(encoded, rooms, time_slots, exams)
+
+    record('decode_individual', time_call(lambda: decode_individual(encoded, rooms, time_slots, exams), repeats))
+    record('get_fitness', time_call(lambda: ga.get_fitness(decoded, exams), repeats))
+
+    # Solver output is silenced so the timings are not dominated by printing
+    with contextlib.redirect_stdout(io.StringIO()):
+        if ga_generations:
+            stats = time_call(lambda: ga.genetic_algorithm(population, ga_generations, float('inf')), 1)
+            record('ga_generation', stats, per=ga_generations)
+        if aco_iterations:
+            aco = ACO(**data)
+            stats = time_call(lambda: aco.run_aco(num_iterations=aco_iterations, num_ants=num_ants,
+                                                  local_search_iterations=local_search_iterations), 1)
+            record('aco_iteration', stats, per=aco_iterations)
+    return results
+
+
+def run_benchmarks(sizes, num_days=15, daily_slots=3, enrollment='uniform', seed=0, directory=None, **options):
+    """Generate and benchmark one instance per ``(exams, students, rooms)`` size"""
+    time_slots = generate_calendar(num_days, daily_slots)
+    rows = []
+    with tempfile.TemporaryDirectory() as scratch:
+        for num_exams, num_students, num_rooms in sizes:
+            name = f"{num_exams}x{num_students}x{num_rooms}"
+            instance_dir = generate_instance(os.path.join(directory or scratch, name), num_exams,
+                                             num_students, num_rooms, enrollment=enrollment, seed=seed)
+            instance = load_instance(instance_dir)
+            print(f"[BENCHMARK] {name} ({len(time_slots)} timeslots)")
+            for result in benchmark_instance(instance, time_slots, seed=seed, **options):
+                row = {
+                    'instance': name,
+                    'exams': num_exams,
+                    'students': num_students,
+                    'rooms': num_rooms,
+                    'timeslots': len(time_slots),
+                    'enrollment': enrollment,
+                    **result,
+                }
+                print(f"  - {row['stage']}: {row['mean_s'] * 1000:.2f} ms")
+                rows.append(row)
+    return rows
+
+
+def write_results(rows, output):
+    """Write ``output.json`` (with run metadata) and ``output.csv``"""
+    metadata = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+    with open(f"{output}.json", 'w') as file:
+        json.dump({'metadata': metadata, 'results': rows}, file, indent=2)
+    with open(f"{output}.csv", 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=list(rows[0]) if rows else [])
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def parse_size(text):
+    """Parse "EXAMSxSTUDENTSxROOMS", e.g. "100x5000x40" """
+    parts = text.lower().split('x')
+    if len(parts) != 3:
+        raise argparse.ArgumentTypeError(f"Expected EXAMSxSTUDENTSxROOMS, got {text!r}")
+    return tuple(int(part) for part in parts)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark GA and ACO on synthetic instances")
+    parser.add_argument('--sizes', nargs='+', type=parse_size, default=[(22, 1000, 25), (100, 5000, 40)],
+                        help="instance sizes as EXAMSxSTUDENTSxROOMS")
+    parser.add_argument('--days', type=int, default=15, help="number of exam days")
+    parser.add_argument('--daily-slots', type=int, default=3)
+    parser.add_argument('--enrollment', choices=ENROLLMENT_DISTRIBUTIONS, default='uniform')
+    parser.add_argument('--repeats', type=int, default=5, help="repeats for decode/fitness timings")
+    parser.add_argument('--population', type=int, default=20)
+    parser.add_argument('--ga-generations', type=int, default=5, help="0 skips the GA")
+    parser.add_argument('--aco-iterations', type=int, default=2, help="0 skips ACO")
+    parser.add_argument('--ants', type=int, default=5)
+    parser.add_argument('--local-search', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--keep-instances', metavar='DIR', help="write the generated CSVs here")
+    parser.add_argument('--output', default='benchmark_results', help="results path without extension")
+    args = parser.parse_args()
+
+    rows = run_benchmarks(
+        args.sizes,
+        num_days=args.days,
+        daily_slots=args.daily_slots,
+        enrollment=args.enrollment,
+        seed=args.seed,
+        directory=args.keep_instances,
+        repeats=args.repeats,
+        population_size=args.population,
+        ga_generations=args.ga_generations,
+        aco_iterations=args.aco_iterations,
+        num_ants=args.ants,
+        local_search_iterations=args.local_search,
+    )
+    write_results(rows, args.output)
+    print(f"\nResults written to {args.output}.json and {args.output}.csv")
@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import random
+import tempfile
+
+import numpy as np
+
+from genome import Genome
+
+# Bump when the checkpoint layout changes; older files are rejected
+CHECKPOINT_VERSION = 1
+
+
+class Checkpoint:
+    """Solver state at the end of one generation (GA) or iteration (ACO).
+
+    Holds everything needed to continue the run exactly: the completed
+    ``step``, the run's ``settings`` (keyword arguments of the ``*_steps``
+    generator), the best genome and its fitness, the stagnation counter,
+    the ``random`` module state and either the evaluated ``population``
+    with its ``fitness_scores`` (GA) or the ``pheromone`` matrix (ACO).
+    Saved as an uncompressed ``.npz`` of packed arrays, written atomically
+    so a crash while saving never leaves a broken file behind.
+    """
+
+    def __init__(self, kind, fingerprint, step, settings, best, best_fitness, stagnant, rng_state,
+                 population=None, fitness_scores=None, pheromone=None):
+        self.kind = kind                    # 'genetic_algorithm' or 'run_aco'
+        self.fingerprint = fingerprint      # hash of the instance and calendar
+        self.step = step
+        self.settings = settings
+        self.best = best
+        self.best_fitness = best_fitness
+        self.stagnant = stagnant
+        self.rng_state = rng_state
+        self.population = population
+        self.fitness_scores = fitness_scores
+        self.pheromone = pheromone
+
+    @classmethod
+    def capture(cls, solver, kind, step, settings, best, best_fitness, stagnant, **state):
+        """Checkpoint of ``solver``'s run, taking the current RNG state"""
+        return cls(kind, fingerprint(solver), step, settings, best, best_fitness, stagnant,
+                   random.getstate(), **state)
+
+    def save(self, path):
+        """Write the checkpoint to ``path`` (atomically)"""
+        version, internal, gauss = self.rng_state
+        arrays = {
+            'version': np.int64(CHECKPOINT_VERSION),
+            'kind': np.array(self.kind),
+            'fingerprint': np.array(self.fingerprint),
+            'step': np.int64(self.step),
+            'settings': np.array(json.dumps(self.settings)),
+            # Scores are ints or floats; JSON keeps them exactly as they were
+            'best_fitness': np.array(json.dumps(self.best_fitness)),
+            'stagnant': np.int64(self.stagnant),
+            'rng_version': np.int64(version),
+            'rng_internal': np.array(internal, dtype=np.uint64),
+            'rng_gauss': np.float64(np.nan if gauss is None else gauss),
+            'num_rooms': np.int64(self.best.num_rooms),
+            'best_start': self.best.start,
+            'best_length': self.best.length,
+            'best_rooms': self.best.rooms,
+        }
+        if self.population is not None:
+            arrays['population_start'] = np.stack([genome.start for genome in self.population])
+            arrays['population_length'] = np.stack([genome.length for genome in self.population])
+            arrays['population_rooms'] = np.stack([genome.rooms for genome in self.population])
+            arrays['fitness_scores'] = np.array(json.dumps(list(self.fitness_scores)))
+        if self.pheromone is not None:
+            arrays['pheromone'] = self.pheromone
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=directory, suffix='.npz')
+        try:
+            with os.fdopen(handle, 'wb') as file:
+                np.savez(file, **arrays)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        """Read a checkpoint written by ``save``"""
+        with np.load(path, allow_pickle=False) as data:
+            if int(data['version']) != CHECKPOINT_VERSION:
+                raise ValueError(f"Unsupported checkpoint version in {path}")
+            num_rooms = int(data['num_rooms'])
+            gauss = float(data['rng_gauss'])
+            rng_state = (int(data['rng_version']), tuple(data['rng_internal'].tolist()),
+                         None if np.isnan(gauss) else gauss)
+            population = fitness_scores = pheromone = None
+            if 'population_start' in data:
+                population = [
+                    Genome(start, length, rooms, num_rooms)
+                    for start, length, rooms in zip(data['population_start'], data['population_length'],
+                                                    data['population_rooms'])
+                ]
+                fitness_scores = json.loads(str(data['fitness_scores']))
+            if 'pheromone' in data:
+                pheromone = data['pheromone']
+            return cls(
+                str(data['kind']), str(data['fingerprint']), int(data['step']),
+                json.loads(str(data['settings'])),
+                Genome(data['best_start'], data['best_length'], data['best_rooms'], num_rooms),
+                json.loads(str(data['best_fitness'])), int(data['stagnant']), rng_state,
+                population=population, fitness_scores=fitness_scores, pheromone=pheromone,
+            )
+
+    def check(self, solver, kind):
+        """Raise ValueError unless this checkpoint belongs to a ``kind`` run on ``solver``'s problem"""
+        if self.kind != kind:
+            raise ValueError(f"Checkpoint is for {self.kind}, not {kind}")
+        if self.fingerprint != fingerprint(solver):
+            raise ValueError("Checkpoint was written for a different instance or exam period")
+
+    def restore_rng(self):
+        random.setstate(self.rng_state)
+
+
+def fingerprint(solver):
+    """Hash identifying a solver's instance (enrollments, durations, priorities,
+    rooms) and calendar: everything the fitness of a timetable depends on"""
+    instance = solver.instance
+    calendar = solver.calendar
+    digest = hashlib.blake2b(digest_size=16)
+    for array in (instance.exam_ids, instance.duration, instance.priority, instance.student_ids,
+                  instance.student_ptr, instance.student_idx, instance.room_ids, instance.capacity,
+                  calendar.slot_ids, calendar.day_index, calendar.weekend):
+        digest.update(np.ascontiguousarray(array).tobytes())
+        digest.update(b'\0')
+    return digest.hexdigest()
@@ -0,0 +1,111 @@
+import numpy as np
+
+
+class ConflictGraph:
+    """Exam conflict graph built once from the exam/student enrollments.
+
+    ``overlap[i, j]`` is the number of students shared by exams ``i`` and
+    ``j`` (the diagonal holds each exam's enrollment), ``neighbours[i]``
+    lists the exams sharing at least one student with ``i``, and
+    ``degree``/``weight`` are the neighbour count and total overlap.
+    """
+
+    def __init__(self, student_ptr, student_idx):
+        num_exams = len(student_ptr) - 1
+        seat_exam = np.repeat(np.arange(num_exams), np.diff(student_ptr))
+
+        # Every pair of seats held by the same student links two exams
+        left, right = group_pairs(student_idx, seat_exam)
+        self.overlap = np.zeros((num_exams, num_exams), dtype=np.int32)
+        np.add.at(self.overlap, (seat_exam[left], seat_exam[right]), 1)
+        np.fill_diagonal(self.overlap, np.diff(student_ptr))
+
+        linked = self.overlap > 0
+        np.fill_diagonal(linked, False)
+        self.neighbours = [np.flatnonzero(row) for row in linked]
+        self.degree = linked.sum(axis=1)
+        self.weight = np.where(linked, self.overlap, 0).sum(axis=1)
+
+    @classmethod
+    def from_exams(cls, exams):
+        """Build the graph directly from Exam objects"""
+        counts = [len(exam.students) for exam in exams]
+        student_ptr = np.zeros(len(exams) + 1, dtype=np.int64)
+        np.cumsum(counts, out=student_ptr[1:])
+        student_idx = np.array([s.student_id for exam in exams for s in exam.students], dtype=np.int64)
+        return cls(student_ptr, student_idx)
+
+    def clashing_rows(self, exam_idx, slot_ptr, slot_idx):
+        """Boolean mask of assignments sharing a timeslot with a different
+        exam that has students in common with them."""
+        slot_row = np.repeat(np.arange(len(exam_idx)), np.diff(slot_ptr))
+        slot_exam = exam_idx[slot_row]
+        left, right = group_pairs(slot_idx, slot_exam)
+        a, b = slot_exam[left], slot_exam[right]
+        clash = (a != b) & (self.overlap[a, b] > 0)
+        mask = np.zeros(len(exam_idx), dtype=bool)
+        mask[slot_row[left[clash]]] = True
+        return mask
+
+
+class DSatur:
+    """DSatur ordering for building a timetable one exam at a time.
+
+    The next exam is the unplaced one whose conflicting neighbours already
+    occupy the most distinct timeslots (its saturation), ties broken by
+    the number of neighbours and then the total student overlap.
+    """
+
+    def __init__(self, graph, num_slots):
+        self.graph = graph
+        num_exams = len(graph.degree)
+        self.blocked = np.zeros((num_exams, num_slots), dtype=bool)
+        self.unplaced = np.ones(num_exams, dtype=bool)
+        # Static tie-break key: degree first, then weight
+        self.tie_break = graph.degree * (int(graph.weight.max(initial=0)) + 1) + graph.weight
+
+    def saturation(self):
+        return self.blocked.sum(axis=1)
+
+    def next_exam(self):
+        """Index of the next exam to place, or None when all are placed"""
+        if not self.unplaced.any():
+            return None
+        key = self.saturation() * (int(self.tie_break.max()) + 1) + self.tie_break
+        key = np.where(self.unplaced, key, -1)
+        return int(np.argmax(key))
+
+    def place(self, exam, slots):
+        """Record that ``exam`` was placed in ``slots``"""
+        self.unplaced[exam] = False
+        neighbours = self.graph.neighbours[exam]
+        if len(neighbours) and len(slots):
+            self.blocked[np.ix_(neighbours, list(slots))] = True
+
+    def free_slots(self, exam):
+        """Timeslots not used by any placed neighbour of ``exam``"""
+        return np.flatnonzero(~self.blocked[exam])
+
+
+def group_pairs(groups, members):
+    """Positions ``(left, right)`` of every ordered pair of distinct entries
+    that share a group, e.g. two exams in one timeslot.
+
+    ``members`` is only used for its length; the returned positions index
+    into the original ``groups``/``members`` arrays.
+    """
+    order = np.argsort(groups, kind='stable')
+    sorted_groups = groups[order]
+    if not len(order):
+        return order, order
+    starts = np.flatnonzero(np.concatenate(([True], sorted_groups[1:] != sorted_groups[:-1])))
+    sizes = np.diff(np.concatenate((starts, [len(order)])))
+
+    # Each entry pairs with every entry of its group
+    group_size = np.repeat(sizes, sizes)
+    group_start = np.repeat(starts, sizes)
+    left = np.repeat(np.arange(len(order)), group_size)
+    offsets = np.arange(len(left)) - np.repeat(np.cumsum(group_size) - group_size, group_size)
+    right = np.repeat(group_start, group_size) + offsets
+    keep = left != right
+    return order[left[keep]], order[right[keep]]
@@ -1,33 +1,43 @@
 import csv
+from instance import Instance
 from exam import Exam
 from room import Room
 from student import Student
 
 class Data:
   @staticmethod
-  def read_students():
+  def read_students(path='students.csv'):
     students = []
-    with open('students.csv', mode='r') as file:
+    with open(path, mode='r') as file:
         reader = csv.DictReader(file)
         for row in reader:
             students.append(Student(int(row['id']), row['name']))
     return students
   @staticmethod
-  def read_rooms():
+  def read_rooms(path='rooms.csv'):
       rooms = []
-      with open('rooms.csv', mode='r') as file:
+      with open(path, mode='r') as file:
           reader = csv.DictReader(file)
           for row in reader:
               rooms.append(Room(int(row['id']), row['room_name'], int(row['capacity'])))
       return rooms
   @staticmethod
-  def read_exams(students):
+  def read_exams(students, path='exams.csv'):
       exams = []
       student_dict = {student.student_id: student for student in students}
-      with open('exams.csv', mode='r') as file:
+      with open(path, mode='r') as file:
           reader = csv.DictReader(file)
           for row in reader:
               student_ids = list(map(int, row['student_ids'].split(';')))
               exam_students = [student_dict[sid] for sid in student_ids]
               exams.append(Exam(int(row['id']), row['course_name'], int(row['duration']), exam_students, int(row['priority'])))
       return exams
+  @staticmethod
+  def load_instance(students_path='students.csv', exams_path='exams.csv', rooms_path='rooms.csv', cache=True):
+      # Columnar, streamed alternative to the readers above; Student/Exam/Room
+      # objects are only built when instance.students/exams/rooms are used.
+      # With cache=True the arrays come from a binary cache keyed by a hash
+      # of the CSVs (rebuilt automatically when any of them changes).
+      if cache:
+          return Instance.cached(students_path, exams_path, rooms_path)
+      return Instance.from_csv(students_path, exams_path, rooms_path)
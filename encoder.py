@@ -1,4 +1,5 @@
 from exam import ExamAssignment
+from instrumentation import timed
 
 
 def create_encoded_lists(exams, timeslots, rooms):
@@ -8,6 +9,32 @@ def create_encoded_lists(exams, timeslots, rooms):
     encoded_halls = [f"R{i+1}" for i in range(len(rooms))]
     return encoded_courses, encoded_time_slots, encoded_halls
 
+def parse_assignment(item, num_exams, num_timeslots, num_rooms):
+    """Parse one encoded assignment into (exam_index, slot_indices, room_indices).
+
+    Follows decode_individual: unknown timeslot or room codes are dropped,
+    and None is returned when the item would not decode at all.
+    """
+    parts = item.split('-')
+    if len(parts) != 3:
+        return None
+    exam_code, ts_codes, room_codes = parts
+    exam_index = _code_index(exam_code, "C", num_exams)
+    slots = [i for i in (_code_index(code, "TS", num_timeslots) for code in ts_codes.split('+')) if i is not None]
+    rooms = [i for i in (_code_index(code, "R", num_rooms) for code in room_codes.split('+')) if i is not None]
+    if exam_index is None or not slots or not rooms:
+        return None
+    return exam_index, slots, rooms
+
+def _code_index(code, prefix, size):
+    """Zero-based index of a code like "TS4", or None if it is not valid"""
+    digits = code[len(prefix):]
+    if not code.startswith(prefix) or not digits.isdecimal() or str(int(digits)) != digits:
+        return None
+    index = int(digits) - 1
+    return index if 0 <= index < size else None
+
+@timed('decode_individual')
 def decode_individual(encoded_individual, rooms, timeslots, exams):
     """Decode an encoded individual into a list of assignments."""
     decoded = []
@@ -51,3 +78,14 @@ def decode_individual(encoded_individual, rooms, timeslots, exams):
     
     return decoded
 
+
+def write_encoded(path, encoded_individual):
+    """Save an encoded solution, one "C1-TS1+TS2-R1+R2" assignment per line"""
+    with open(path, 'w') as file:
+        for item in encoded_individual:
+            file.write(f"{item}\n")
+
+def read_encoded(path):
+    """Read an encoded solution written by ``write_encoded``"""
+    with open(path) as file:
+        return [line.strip() for line in file if line.strip()]
@@ -0,0 +1,758 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from conflict_graph import ConflictGraph
+from encoder import parse_assignment
+from instance import Instance
+from instrumentation import count
+from room_packing import RoomPacker
+from Time_Slots import Calendar
+
+# Core penalty weights
+CAPACITY_WEIGHT = 20       # Penalty per student over capacity
+ROOM_CONFLICT_WEIGHT = 40  # Room double-booking
+STUDENT_CONFLICT_WEIGHT = 70  # Direct student conflict
+CONSECUTIVE_EXAMS_WEIGHT = 25  # Consecutive exams on same day
+TIMESLOT_CONSISTENCY_WEIGHT = 50  # Non-consecutive timeslots
+DIFFICULTY_WEIGHT = 3      # Weight for difficulty balancing
+WEEKEND_PENALTY = 10       # Penalty for scheduling on weekends
+SPREAD_BONUS = -5          # Bonus for well-spread exams
+MISSING_ASSIGNMENT_PENALTY = 200  # Assignment without timeslots or rooms
+INVALID_ASSIGNMENT_PENALTY = 150  # Assignment with missing data
+
+
+class FitnessEngine:
+    """Vectorized timetable scorer shared by GA and ACO.
+
+    The exam/student enrollments are stored once as a sparse exam x student
+    incidence matrix in CSR form (``student_ptr``/``student_idx``), and a
+    timetable is scored with array operations over slot and room occupancy.
+    The result is identical to the original per-student dictionary scorer.
+    """
+
+    def __init__(self, exams, rooms, timeslots):
+        self._build(Instance.from_objects(None, exams, rooms), timeslots)
+
+    @classmethod
+    def from_instance(cls, instance, timeslots):
+        """Engine built straight from columnar ``instance.Instance`` data"""
+        engine = cls.__new__(cls)
+        engine._build(instance, timeslots)
+        return engine
+
+    def _build(self, instance, timeslots):
+        self.instance = instance
+        self.calendar = Calendar.from_timeslots(timeslots)
+        self.time_slots = self.calendar.timeslots
+        self.num_exams = instance.num_exams
+        self.num_rooms = instance.num_rooms
+
+        # Index lookups (ids -> dense positions)
+        self.exam_index = {int(eid): i for i, eid in enumerate(instance.exam_ids)}
+        self.room_index = {int(rid): i for i, rid in enumerate(instance.room_ids)}
+        self.slot_index = self.calendar.slot_index
+
+        # Exam attributes
+        self.exam_ids = instance.exam_ids.astype(np.int64)
+        self.difficulty = instance.priority.astype(np.int64)
+
+        # Exam x student incidence matrix (CSR)
+        self.student_ids = instance.student_ids.astype(np.int64)
+        self.enrollment = instance.enrollment
+        self.student_ptr = instance.student_ptr
+        self.student_idx = instance.student_idx.astype(np.int64)
+        self.conflict_graph = ConflictGraph(self.student_ptr, self.student_idx)
+
+        # Room attributes
+        self.room_ids = instance.room_ids.astype(np.int64)
+        self.capacity = instance.capacity.astype(np.int64)
+        self.room_packer = RoomPacker(self.capacity)
+
+        # Timeslot attributes (precomputed by the calendar): day index per slot, weekend flag
+        self.slot_ids = self.calendar.slot_ids
+        self.slot_dates = self.calendar.date_strs
+        self.slot_day = self.calendar.day_index
+        self.slot_weekend = self.calendar.weekend
+        self.num_days = self.calendar.num_days
+
+    def layout(self, decoded_timetable):
+        """Convert a decoded timetable into flat index arrays.
+
+        Returns ``(exam_idx, slot_ptr, slot_idx, room_ptr, room_idx, invalid)``
+        where slots and rooms of assignment ``a`` are
+        ``slot_idx[slot_ptr[a]:slot_ptr[a+1]]`` and likewise for rooms, and
+        ``invalid`` counts assignments with missing data.
+        """
+        exam_idx, slot_counts, room_counts, slot_idx, room_idx = [], [], [], [], []
+        invalid = 0
+        for assignment in decoded_timetable:
+            try:
+                exam = self.exam_index[assignment['exam'].exam_id]
+                slots = [self.slot_index[ts.timeslot_id] for ts in assignment['timeslots']]
+                rooms = [self.room_index[room.room_id] for room in assignment['rooms']]
+            except (KeyError, AttributeError):
+                invalid += 1
+                continue
+            exam_idx.append(exam)
+            slot_counts.append(len(slots))
+            room_counts.append(len(rooms))
+            slot_idx.extend(slots)
+            room_idx.extend(rooms)
+
+        slot_ptr = np.zeros(len(exam_idx) + 1, dtype=np.int64)
+        room_ptr = np.zeros(len(exam_idx) + 1, dtype=np.int64)
+        np.cumsum(slot_counts, out=slot_ptr[1:])
+        np.cumsum(room_counts, out=room_ptr[1:])
+        return (np.array(exam_idx, dtype=np.int64), slot_ptr, np.array(slot_idx, dtype=np.int64),
+                room_ptr, np.array(room_idx, dtype=np.int64), invalid)
+
+    def evaluate(self, decoded_timetable):
+        """Return the fitness (negative penalty) of a decoded timetable"""
+        return self.score(*self.layout(decoded_timetable))
+
+    def score(self, exam_idx, slot_ptr, slot_idx, room_ptr, room_idx, invalid=0):
+        """Return the fitness (negative penalty) of a timetable in index form"""
+        return -self._penalty(exam_idx, slot_ptr, slot_idx, room_ptr, room_idx, invalid)[0]
+
+    def score_genome(self, genome):
+        """Return the fitness (negative penalty) of a Genome"""
+        return self.score(*genome.layout())
+
+    def conflict_report(self, decoded_timetable):
+        """Score a decoded timetable and list every conflict it contains"""
+        penalty, parts = self._penalty(*self.layout(decoded_timetable))
+        exam_idx, slot_ptr, slot_idx = parts['exam_idx'], parts['slot_ptr'], parts['slot_idx']
+        ts = self.time_slots
+        dates = self.slot_dates
+
+        capacity_issues = [
+            (int(self.exam_ids[e]), int(self.enrollment[e]), int(cap))
+            for e, cap in zip(exam_idx[parts['deficit_rows']], parts['deficit_capacity'])
+        ]
+        room_conflicts = [
+            (int(self.room_ids[r]), dates[t], ts[t].timeslot_id,
+             int(self.exam_ids[owner]), int(self.exam_ids[e]))
+            for t, r, owner, e in zip(*parts['room_clashes'])
+        ]
+        student_conflicts = [
+            (int(self.student_ids[s]), dates[t], ts[t].timeslot_id,
+             int(self.exam_ids[owner]), int(self.exam_ids[e]))
+            for t, s, owner, e in zip(*parts['student_clashes'])
+        ]
+        non_consecutive_slots = [
+            (int(self.exam_ids[exam_idx[a]]),
+             [ts[t].timeslot_id for t in slot_idx[slot_ptr[a]:slot_ptr[a + 1]]])
+            for a in parts['broken_rows']
+        ]
+        # The legacy scorer rebuilt its per-day exam list for every
+        # (exam, student) pair, so it never saw two exams on the same day
+        # and this list always stayed empty; keep that behaviour so
+        # penalties remain comparable.
+        consecutive_exams = []
+
+        return {
+            'fitness': -penalty,
+            'student_conflicts': student_conflicts,
+            'room_conflicts': room_conflicts,
+            'consecutive_exams': consecutive_exams,
+            'capacity_issues': capacity_issues,
+            'non_consecutive_slots': non_consecutive_slots,
+            'conflict_stats': {
+                'student_conflicts': len(student_conflicts),
+                'room_conflicts': len(room_conflicts),
+                'consecutive_exams': len(consecutive_exams),
+                'capacity_issues': len(capacity_issues),
+                'non_consecutive_slots': len(non_consecutive_slots),
+            },
+        }
+
+    def _penalty(self, exam_idx, slot_ptr, slot_idx, room_ptr, room_idx, invalid):
+        slot_counts = np.diff(slot_ptr)
+        room_counts = np.diff(room_ptr)
+        valid = (slot_counts > 0) & (room_counts > 0)
+        penalty = INVALID_ASSIGNMENT_PENALTY * invalid
+        penalty += MISSING_ASSIGNMENT_PENALTY * int(np.count_nonzero(~valid))
+
+        # Drop assignments without slots or rooms, they only carry the flat penalty
+        if not valid.all():
+            keep_slots = np.repeat(valid, slot_counts)
+            keep_rooms = np.repeat(valid, room_counts)
+            exam_idx, slot_idx, room_idx = exam_idx[valid], slot_idx[keep_slots], room_idx[keep_rooms]
+            slot_counts, room_counts = slot_counts[valid], room_counts[valid]
+            slot_ptr = _pointers(slot_counts)
+            room_ptr = _pointers(room_counts)
+        rows = np.arange(len(exam_idx))
+        slot_row = np.repeat(rows, slot_counts)
+        parts = {'exam_idx': exam_idx, 'slot_ptr': slot_ptr, 'slot_idx': slot_idx}
+
+        # 1. Room capacity with progressive penalty
+        total_capacity = np.add.reduceat(self.capacity[room_idx], room_ptr[:-1]) if len(rows) else np.zeros(0, dtype=np.int64)
+        deficit = self.enrollment[exam_idx] - total_capacity
+        short = deficit > 0
+        if short.any():
+            d = deficit[short]
+            penalty += float(np.sum(CAPACITY_WEIGHT * (d + np.floor_divide(d ** 1.5, 10))))
+        parts['deficit_rows'] = np.flatnonzero(short)
+        parts['deficit_capacity'] = total_capacity[short]
+
+        # 2. Room double-booking: every (slot, room) cell after its first booking
+        pair_counts = slot_counts * room_counts
+        pair_row = np.repeat(rows, pair_counts)
+        local = np.arange(len(pair_row)) - np.repeat(_pointers(pair_counts)[:-1], pair_counts)
+        per_row = np.repeat(room_counts, pair_counts)
+        pair_slot = slot_idx[slot_ptr[pair_row] + local // per_row]
+        pair_room = room_idx[room_ptr[pair_row] + local % per_row]
+        owner, repeat = _first_owner(pair_slot * self.num_rooms + pair_room, exam_idx[pair_row])
+        same = owner == exam_idx[pair_row]
+        penalty += (ROOM_CONFLICT_WEIGHT // 2) * int(np.count_nonzero(repeat & same))
+        clash = repeat & ~same
+        penalty += ROOM_CONFLICT_WEIGHT * int(np.count_nonzero(clash))
+        parts['room_clashes'] = (pair_slot[clash], pair_room[clash], owner[clash], exam_idx[pair_row][clash])
+
+        # 3. Student conflicts: every (student, slot) seat taken by another exam.
+        # Only exams sharing a timeslot with an overlapping exam can clash,
+        # so seats are expanded for those assignments alone.
+        clashing = self.conflict_graph.clashing_rows(exam_idx, slot_ptr, slot_idx)
+        seats = self.enrollment[exam_idx] * slot_counts * clashing
+        seat_row = np.repeat(rows, seats)
+        local = np.arange(len(seat_row)) - np.repeat(_pointers(seats)[:-1], seats)
+        per_row = np.repeat(slot_counts, seats)
+        seat_student = self.student_idx[self.student_ptr[exam_idx[seat_row]] + local // per_row]
+        seat_slot = slot_idx[slot_ptr[seat_row] + local % per_row]
+        seat_exam = exam_idx[seat_row]
+        owner, repeat = _first_owner(seat_slot * len(self.student_ids) + seat_student, seat_exam)
+        clash = repeat & (owner != seat_exam)
+        penalty += STUDENT_CONFLICT_WEIGHT * int(np.count_nonzero(clash))
+        parts['student_clashes'] = (seat_slot[clash], seat_student[clash], owner[clash], seat_exam[clash])
+
+        # 4. Multi-slot exams must use consecutive timeslots on one day
+        follow = np.ones(len(slot_idx), dtype=bool)
+        follow[slot_ptr[:-1]] = False
+        first_slot = slot_idx[slot_ptr[:-1]]
+        step_ok = np.ones(len(slot_idx), dtype=bool)
+        step_ok[1:] = self.slot_ids[slot_idx[1:]] == self.slot_ids[slot_idx[:-1]] + 1
+        day_ok = self.slot_day[slot_idx] == self.slot_day[first_slot][slot_row]
+        broken = follow & ~(step_ok & day_ok)
+        broken_rows = np.unique(slot_row[broken])
+        penalty += TIMESLOT_CONSISTENCY_WEIGHT * len(broken_rows)
+        parts['broken_rows'] = broken_rows
+
+        # Weekend penalty on the first slot
+        penalty += WEEKEND_PENALTY * int(np.count_nonzero(self.slot_weekend[first_slot]))
+
+        # 5. Difficulty balancing per day, in order of first appearance
+        first_day = self.slot_day[first_slot]
+        days, first_seen = np.unique(first_day, return_index=True)
+        exams_per_day = np.bincount(first_day, minlength=self.num_days)
+        difficulty_per_day = np.bincount(first_day, weights=self.difficulty[exam_idx], minlength=self.num_days)
+        for day in days[np.argsort(first_seen)]:
+            count = int(exams_per_day[day])
+            if count > 1:
+                total_difficulty = int(difficulty_per_day[day])
+                avg_difficulty = total_difficulty / count
+                if avg_difficulty > 3.5:
+                    penalty += DIFFICULTY_WEIGHT * (avg_difficulty - 3.5) ** 2 * count
+                if total_difficulty > 15:
+                    penalty += DIFFICULTY_WEIGHT * (total_difficulty - 15)
+
+        # 6. Bonus for spreading exams over the exam period
+        if len(days):
+            spread_ratio = len(days) / self.num_days
+            if spread_ratio > 0.7:
+                penalty += SPREAD_BONUS * int(spread_ratio * 10)
+
+        return penalty, parts
+
+
+class FitnessCache:
+    """Bounded LRU memo of genome fitness, keyed by ``Genome.digest()``.
+
+    GA populations keep re-creating individuals they have already scored
+    (elites, identical crossover children, converged ant solutions), so
+    every full evaluation goes through ``score``.  At most ``maxsize``
+    scores are kept, least recently used first out.  ``report`` keeps the
+    last few full conflict reports the same way, so the final
+    re-evaluation of a solver's best timetable is not recomputed.
+    ``hits``/``misses`` (also fed to the ``fitness_cache.*`` counters)
+    show how many evaluations were saved.
+    """
+
+    def __init__(self, engine, maxsize=50000, report_size=4):
+        self.engine = engine
+        self.maxsize = maxsize
+        self.report_size = report_size
+        self._scores = OrderedDict()
+        self._reports = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._scores)
+
+    def score(self, genome):
+        """Fitness of a Genome, computed only if it is not cached"""
+        key = genome.digest()
+        fitness = self._scores.get(key)
+        if fitness is not None:
+            self._scores.move_to_end(key)
+            self._hit(1)
+            return fitness
+        fitness = self.engine.score_genome(genome)
+        self._miss(1)
+        self._store(key, fitness)
+        return fitness
+
+    def score_all(self, genomes, evaluate=None):
+        """Fitness of every genome in order.
+
+        Only the distinct genomes missing from the cache are scored, in one
+        call of ``evaluate(genomes) -> scores`` (by default one by one with
+        the engine), e.g. on a process pool.
+        """
+        keys = [genome.digest() for genome in genomes]
+        found = {}
+        missing = {}
+        for key, genome in zip(keys, genomes):
+            if key in found or key in missing:
+                continue
+            fitness = self._scores.get(key)
+            if fitness is not None:
+                self._scores.move_to_end(key)
+                found[key] = fitness
+            else:
+                missing[key] = genome
+
+        if missing:
+            if evaluate is None:
+                scores = [self.engine.score_genome(genome) for genome in missing.values()]
+            else:
+                scores = evaluate(list(missing.values()))
+            for key, fitness in zip(missing, scores):
+                found[key] = fitness
+                self._store(key, fitness)
+        self._miss(len(missing))
+        self._hit(len(genomes) - len(missing))
+        return [found[key] for key in keys]
+
+    def report(self, genome, decoded_timetable):
+        """``FitnessEngine.conflict_report`` of a genome and its decoded timetable"""
+        key = genome.digest()
+        report = self._reports.get(key)
+        if report is None:
+            report = self.engine.conflict_report(decoded_timetable)
+            self._reports[key] = report
+            if len(self._reports) > self.report_size:
+                self._reports.popitem(last=False)
+            self._store(key, report['fitness'])
+        else:
+            self._reports.move_to_end(key)
+            count('fitness_cache.report_hits')
+        return report
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+            'size': len(self._scores),
+            'maxsize': self.maxsize,
+        }
+
+    def summary(self):
+        """One-line hit-rate summary"""
+        return (f"{self.hits} hits / {self.hits + self.misses} lookups ({100.0 * self.hit_rate:.1f}%), "
+                f"{len(self._scores)} cached")
+
+    def clear(self):
+        self._scores.clear()
+        self._reports.clear()
+        self.hits = self.misses = 0
+
+    def _store(self, key, fitness):
+        self._scores[key] = fitness
+        self._scores.move_to_end(key)
+        if len(self._scores) > self.maxsize:
+            self._scores.popitem(last=False)
+
+    def _hit(self, amount):
+        self.hits += amount
+        count('fitness_cache.hits', amount)
+
+    def _miss(self, amount):
+        self.misses += amount
+        count('fitness_cache.misses', amount)
+
+
+def _pointers(counts):
+    """Prefix sums of ``counts`` with a leading zero"""
+    ptr = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=ptr[1:])
+    return ptr
+
+
+def _first_owner(keys, exams):
+    """For each occurrence of a key, return the exam that booked it first
+    and whether this occurrence is a repeat of an earlier one."""
+    if not len(keys):
+        return exams, np.zeros(0, dtype=bool)
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    first_of = first[inverse]
+    return exams[first_of], first_of != np.arange(len(keys))
+
+
+class IncrementalEvaluator:
+    """Timetable state that scores single-exam moves incrementally.
+
+    Holds per-slot student and room occupancy counts, per-exam penalties
+    and per-day exam/difficulty totals for one timetable, so the penalty
+    change of moving one exam costs time proportional to that exam's
+    enrollment instead of a full re-evaluation.  Exams are addressed by
+    index; an exam with no slots or no rooms is treated as unscheduled.
+
+    Penalties match ``FitnessEngine`` (up to float rounding of the
+    difficulty term).  Timetables where an exam repeats a slot or room
+    depend on assignment order, so moves touching such states fall back to
+    a full evaluation.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.num_students = len(engine.student_ids)
+        self.num_rooms = engine.num_rooms
+        self._reset()
+
+    def _reset(self):
+        engine = self.engine
+        num_exams = engine.num_exams
+        self.slots = [()] * num_exams
+        self.rooms = [()] * num_exams
+        self.order = []
+        self.irregular = set()
+
+        num_slots = len(engine.time_slots)
+        self.student_load = np.zeros(num_slots * self.num_students, dtype=np.int32)
+        self.room_load = np.zeros(num_slots * self.num_rooms, dtype=np.int32)
+        self.day_exams = np.zeros(engine.num_days, dtype=np.int64)
+        self.day_difficulty = np.zeros(engine.num_days, dtype=np.int64)
+        self.exam_penalty = [0] * num_exams
+        self.student_excess = 0
+        self.room_excess = 0
+
+    def load(self, assignments):
+        """Reset the state to ``assignments``, a list of
+        ``(exam_idx, slot_indices, room_indices)`` tuples."""
+        self._reset()
+        for exam, slots, rooms in assignments:
+            if exam in self.order:
+                raise ValueError(f"Exam index {exam} is assigned more than once")
+            self.move(exam, slots, rooms)
+        return self
+
+    def load_decoded(self, decoded_timetable):
+        """Reset the state to a decoded timetable"""
+        engine = self.engine
+        return self.load(
+            (engine.exam_index[a['exam'].exam_id],
+             [engine.slot_index[ts.timeslot_id] for ts in a['timeslots']],
+             [engine.room_index[room.room_id] for room in a['rooms']])
+            for a in decoded_timetable
+        )
+
+    def load_encoded(self, encoded_individual):
+        """Reset the state to an encoded individual ("C1-TS1+TS2-R1+R2" strings)"""
+        engine = self.engine
+        sizes = (engine.num_exams, len(engine.time_slots), engine.num_rooms)
+        parsed = (parse_assignment(item, *sizes) for item in encoded_individual)
+        return self.load(a for a in parsed if a is not None)
+
+    def load_genome(self, genome):
+        """Reset the state to a Genome"""
+        return self.load(genome.assignments())
+
+    @property
+    def penalty(self):
+        return (STUDENT_CONFLICT_WEIGHT * self.student_excess
+                + ROOM_CONFLICT_WEIGHT * self.room_excess
+                + sum(self.exam_penalty)
+                + sum(_day_penalty(c, d) for c, d in zip(self.day_exams, self.day_difficulty) if c > 1)
+                + self._spread_penalty(np.count_nonzero(self.day_exams)))
+
+    @property
+    def fitness(self):
+        if self.irregular:
+            return -self._full_penalty()
+        return -self.penalty
+
+    def delta(self, exam, slots, rooms):
+        """Penalty change (positive is worse) of reassigning ``exam`` to
+        ``slots`` and ``rooms`` without changing the state."""
+        slots, rooms = _placement(slots, rooms)
+        if self.irregular or not _distinct(slots, rooms):
+            return self._full_penalty({exam: (slots, rooms)}) - self._full_penalty()
+        return self._change(exam, slots, rooms)[0]
+
+    def placement_deltas(self, exam, windows, room_sets, candidates):
+        """Penalty changes of placing the unscheduled ``exam`` on every
+        candidate at once, as a float array matching ``delta``.
+
+        ``windows`` holds timeslot index rows of equal length, ``room_sets``
+        boolean room masks, and each ``candidates`` row is a (window, room
+        set) index pair into them.  Placing an unscheduled exam splits into
+        per-window terms (students, days, weekend, consistency) and per-room
+        set terms (capacity, double-booking over the window), which are
+        computed once each.  Scheduled exams and irregular states fall back
+        to ``delta`` per candidate.
+        """
+        engine = self.engine
+        windows = np.asarray(windows, dtype=np.int64)
+        room_sets = np.asarray(room_sets, dtype=bool)
+        candidates = np.asarray(candidates, dtype=np.int64).reshape(-1, 2)
+        window_of, set_of = candidates[:, 0], candidates[:, 1]
+        ordered = np.sort(windows, axis=1)
+        if (self.slots[exam] or self.irregular or not windows.shape[1]
+                or (ordered[:, 1:] == ordered[:, :-1]).any() or not room_sets.any(axis=1).all()):
+            return np.array([self.delta(exam, windows[w], np.flatnonzero(room_sets[s]))
+                             for w, s in zip(window_of.tolist(), set_of.tolist())], dtype=float)
+
+        num_slots = len(engine.time_slots)
+        students = engine.student_idx[engine.student_ptr[exam]:engine.student_ptr[exam + 1]]
+
+        # Per window: students already sitting an exam, weekend start,
+        # broken consecutiveness, day balance and spread
+        student_load = self.student_load.reshape(num_slots, self.num_students)
+        window_penalty = STUDENT_CONFLICT_WEIGHT * np.count_nonzero(
+            student_load[windows[:, :, None], students] >= 1, axis=(1, 2)).astype(float)
+        window_penalty += WEEKEND_PENALTY * engine.slot_weekend[windows[:, 0]]
+        if windows.shape[1] > 1:
+            ids = engine.slot_ids[windows]
+            days = engine.slot_day[windows]
+            broken = (np.diff(ids, axis=1) != 1).any(axis=1) | (days != days[:, :1]).any(axis=1)
+            window_penalty += TIMESLOT_CONSISTENCY_WEIGHT * broken
+        day = engine.slot_day[windows[:, 0]]
+        day_exams, day_difficulty = self.day_exams[day], self.day_difficulty[day]
+        window_penalty += (_day_penalties(day_exams + 1, day_difficulty + int(engine.difficulty[exam]))
+                           - _day_penalties(day_exams, day_difficulty))
+        used = np.count_nonzero(self.day_exams)
+        window_penalty += np.where(day_exams == 0, self._spread_penalty(used + 1) - self._spread_penalty(used), 0)
+
+        # Per room set: seats short of the enrollment
+        deficit = (int(engine.enrollment[exam]) - room_sets @ engine.capacity).astype(float)
+        set_penalty = np.where(deficit > 0, CAPACITY_WEIGHT * (deficit + np.floor_divide(np.maximum(deficit, 0) ** 1.5, 10)), 0)
+
+        # Per candidate: rooms already booked in the window's slots
+        room_busy = np.count_nonzero(self.room_load.reshape(num_slots, self.num_rooms)[windows] >= 1, axis=1)
+        room_excess = (room_busy[window_of] * room_sets[set_of]).sum(axis=1)
+
+        return (window_penalty[window_of] + set_penalty[set_of] + ROOM_CONFLICT_WEIGHT * room_excess
+                - self.exam_penalty[exam])
+
+    def move(self, exam, slots, rooms):
+        """Reassign ``exam`` to ``slots`` and ``rooms`` and return the
+        penalty change."""
+        slots, rooms = _placement(slots, rooms)
+        change, student_cells, room_cells, day_change = self._change(exam, slots, rooms)
+        if self.irregular or not _distinct(slots, rooms):
+            change = self._full_penalty({exam: (slots, rooms)}) - self._full_penalty()
+
+        # Apply occupancy and per-day updates
+        cells, counts = student_cells
+        self.student_load[cells] += counts
+        cells, counts = room_cells
+        self.room_load[cells] += counts
+        self.student_excess += day_change['student_excess']
+        self.room_excess += day_change['room_excess']
+        for day, exams, difficulty in day_change['days']:
+            self.day_exams[day] += exams
+            self.day_difficulty[day] += difficulty
+        self.exam_penalty[exam] = day_change['exam_penalty']
+
+        self.slots[exam], self.rooms[exam] = slots, rooms
+        if exam not in self.order:
+            self.order.append(exam)
+        if _distinct(slots, rooms):
+            self.irregular.discard(exam)
+        else:
+            self.irregular.add(exam)
+        return change
+
+    def _change(self, exam, slots, rooms):
+        engine = self.engine
+        old_slots, old_rooms = self.slots[exam], self.rooms[exam]
+        students = engine.student_idx[engine.student_ptr[exam]:engine.student_ptr[exam + 1]]
+
+        # Student and room occupancy cells touched by the move
+        if _distinct(old_slots, old_rooms) and _distinct(slots, rooms):
+            # Cells are distinct, so only slots/pairs that differ need updating
+            student_cells, student_excess = _set_changes(
+                self.student_load,
+                [t * self.num_students for t in old_slots if t not in slots],
+                [t * self.num_students for t in slots if t not in old_slots], students)
+            old_pairs = {t * self.num_rooms + r for t in old_slots for r in old_rooms}
+            new_pairs = {t * self.num_rooms + r for t in slots for r in rooms}
+            room_cells, room_excess = _set_changes(
+                self.room_load, list(old_pairs - new_pairs), list(new_pairs - old_pairs))
+        else:
+            student_cells = _cell_changes(old_slots, slots, students, self.num_students)
+            room_cells = _cell_changes(
+                [t for t in old_slots for _ in old_rooms], [t for t in slots for _ in rooms],
+                None, self.num_rooms, list(old_rooms) * len(old_slots), list(rooms) * len(slots))
+            student_excess = _excess_change(self.student_load, *student_cells)
+            room_excess = _excess_change(self.room_load, *room_cells)
+
+        # Per-exam penalties (capacity, consistency, weekend)
+        new_exam_penalty = self._exam_penalty(exam, slots, rooms)
+        change = (STUDENT_CONFLICT_WEIGHT * student_excess + ROOM_CONFLICT_WEIGHT * room_excess
+                  + new_exam_penalty - self.exam_penalty[exam])
+
+        # Per-day difficulty balance and spread
+        days = []
+        if old_slots:
+            days.append((int(engine.slot_day[old_slots[0]]), -1, -int(engine.difficulty[exam])))
+        if slots:
+            days.append((int(engine.slot_day[slots[0]]), 1, int(engine.difficulty[exam])))
+        if days:
+            day_exams = self.day_exams.copy()
+            day_difficulty = self.day_difficulty.copy()
+            touched = {day for day, _, _ in days}
+            before = sum(_day_penalty(day_exams[d], day_difficulty[d]) for d in touched if day_exams[d] > 1)
+            used_before = np.count_nonzero(day_exams)
+            for day, exams, difficulty in days:
+                day_exams[day] += exams
+                day_difficulty[day] += difficulty
+            after = sum(_day_penalty(day_exams[d], day_difficulty[d]) for d in touched if day_exams[d] > 1)
+            change += after - before
+            change += self._spread_penalty(np.count_nonzero(day_exams)) - self._spread_penalty(used_before)
+
+        return change, student_cells, room_cells, {
+            'student_excess': student_excess,
+            'room_excess': room_excess,
+            'exam_penalty': new_exam_penalty,
+            'days': days,
+        }
+
+    def _exam_penalty(self, exam, slots, rooms):
+        engine = self.engine
+        if not slots:
+            return 0
+        penalty = 0
+        deficit = int(engine.enrollment[exam]) - int(engine.capacity[list(rooms)].sum())
+        if deficit > 0:
+            penalty += CAPACITY_WEIGHT * (deficit + (deficit ** 1.5) // 10)
+        if len(slots) > 1:
+            ids = engine.slot_ids[list(slots)]
+            days = engine.slot_day[list(slots)]
+            if (np.diff(ids) != 1).any() or (days != days[0]).any():
+                penalty += TIMESLOT_CONSISTENCY_WEIGHT
+        if engine.slot_weekend[slots[0]]:
+            penalty += WEEKEND_PENALTY
+        return penalty
+
+    def _spread_penalty(self, days_used):
+        if not days_used:
+            return 0
+        spread_ratio = days_used / self.engine.num_days
+        if spread_ratio > 0.7:
+            return SPREAD_BONUS * int(spread_ratio * 10)
+        return 0
+
+    def _full_penalty(self, overrides=None):
+        overrides = overrides or {}
+        order = self.order + [e for e in overrides if e not in self.order]
+        exam_idx, slot_counts, room_counts, slot_idx, room_idx = [], [], [], [], []
+        for exam in order:
+            slots, rooms = overrides.get(exam, (self.slots[exam], self.rooms[exam]))
+            if not slots:
+                continue
+            exam_idx.append(exam)
+            slot_counts.append(len(slots))
+            room_counts.append(len(rooms))
+            slot_idx.extend(slots)
+            room_idx.extend(rooms)
+        return self.engine._penalty(
+            np.array(exam_idx, dtype=np.int64), _pointers(slot_counts), np.array(slot_idx, dtype=np.int64),
+            _pointers(room_counts), np.array(room_idx, dtype=np.int64), 0)[0]
+
+
+def _day_penalty(count, total_difficulty):
+    """Difficulty balancing penalty of one day holding ``count`` > 1 exams"""
+    count, total_difficulty = int(count), int(total_difficulty)
+    penalty = 0
+    avg_difficulty = total_difficulty / count
+    if avg_difficulty > 3.5:
+        penalty += DIFFICULTY_WEIGHT * (avg_difficulty - 3.5) ** 2 * count
+    if total_difficulty > 15:
+        penalty += DIFFICULTY_WEIGHT * (total_difficulty - 15)
+    return penalty
+
+
+def _day_penalties(count, total_difficulty):
+    """``_day_penalty`` over arrays of days (0 for days with at most one exam)"""
+    count = np.asarray(count, dtype=np.int64)
+    total_difficulty = np.asarray(total_difficulty, dtype=np.int64)
+    avg_difficulty = total_difficulty / np.maximum(count, 1)
+    penalty = np.where(avg_difficulty > 3.5, DIFFICULTY_WEIGHT * (avg_difficulty - 3.5) ** 2 * count, 0.0)
+    penalty += np.where(total_difficulty > 15, DIFFICULTY_WEIGHT * (total_difficulty - 15), 0)
+    return np.where(count > 1, penalty, 0.0)
+
+
+def _placement(slots, rooms):
+    """Normalize a placement; missing slots or rooms mean unscheduled"""
+    slots, rooms = tuple(int(t) for t in slots), tuple(int(r) for r in rooms)
+    if not slots or not rooms:
+        return (), ()
+    return slots, rooms
+
+
+def _distinct(slots, rooms):
+    return len(set(slots)) == len(slots) and len(set(rooms)) == len(rooms)
+
+
+def _set_changes(load, removed, added, members=None):
+    """Occupancy cells and double-booking change for disjoint cell sets.
+
+    ``removed`` and ``added`` are cell offsets, expanded by ``members``
+    when given.
+    """
+    removed = np.asarray(removed, dtype=np.int64)
+    added = np.asarray(added, dtype=np.int64)
+    if members is not None:
+        removed = (removed[:, None] + members).ravel()
+        added = (added[:, None] + members).ravel()
+    excess = int(np.count_nonzero(load[added] >= 1)) - int(np.count_nonzero(load[removed] >= 2))
+    cells = np.concatenate((removed, added))
+    counts = np.concatenate((-np.ones(len(removed), dtype=np.int32), np.ones(len(added), dtype=np.int32)))
+    return (cells, counts), excess
+
+
+def _cell_changes(old_slots, new_slots, members, width, old_members=None, new_members=None):
+    """Flat occupancy cells touched by a move and their count changes.
+
+    Cells are ``slot * width + member``; with ``members`` every slot is
+    paired with every member, otherwise slots and members are given
+    pairwise.
+    """
+    if members is not None:
+        old = (np.repeat(np.asarray(old_slots, dtype=np.int64), len(members)) * width
+               + np.tile(members, len(old_slots)))
+        new = (np.repeat(np.asarray(new_slots, dtype=np.int64), len(members)) * width
+               + np.tile(members, len(new_slots)))
+    else:
+        old = np.asarray(old_slots, dtype=np.int64) * width + np.asarray(old_members, dtype=np.int64)
+        new = np.asarray(new_slots, dtype=np.int64) * width + np.asarray(new_members, dtype=np.int64)
+    cells, inverse = np.unique(np.concatenate((old, new)), return_inverse=True)
+    signs = np.concatenate((-np.ones(len(old), dtype=np.int32), np.ones(len(new), dtype=np.int32)))
+    counts = np.bincount(inverse, weights=signs, minlength=len(cells)).astype(np.int32)
+    return cells, counts
+
+
+def _excess_change(load, cells, counts):
+    """Change in the number of double-booked seats over ``cells``"""
+    before = load[cells]
+    after = before + counts
+    return int(np.maximum(after - 1, 0).sum() - np.maximum(before - 1, 0).sum())
@@ -1,381 +1,532 @@
 import random
+import time
 from datetime import datetime
-from Time_Slots import generate_timeslots, timeslots
-from encoder import create_encoded_lists, decode_individual
-from data import Data
+import numpy as np
+from anytime import Budget, Progress, drive
+from checkpoint import Checkpoint
+from encoder import create_encoded_lists
+from fitness import IncrementalEvaluator
+from genome import Genome
+from instrumentation import count, timer
+from parallel import create_pool, run_island_epochs, score_population
+from seeding import Seeder
+from solver import Solver
 import room
 
-class GeneticAlgorithm:
-    def __init__(self):
-        # Read data for decoding/encoding
-        self.students = Data.read_students()
-        self.exams = Data.read_exams(self.students)
-        self.rooms = Data.read_rooms()
-        self.time_slots = timeslots
+# Replacement schemes of genetic_algorithm (see GeneticAlgorithm.breed)
+REPLACEMENTS = ('generational', 'elitism', 'steady_state', 'mu_plus_lambda')
+
+# Crossover operators (see GeneticAlgorithm.crossover_timetables)
+CROSSOVERS = ('two_point', 'day', 'conflict_uniform')
+
+# Initial populations (see GeneticAlgorithm.generate_population)
+SEEDINGS = ('random', 'dsatur')
+
+# Island migration topologies (see GeneticAlgorithm.island_model)
+TOPOLOGIES = ('ring', 'full')
+
+class GeneticAlgorithm(Solver):
+    def __init__(self, students=None, exams=None, rooms=None, time_slots=None, instance=None):
+        super().__init__(students, exams, rooms, time_slots, instance)
+        
+        # Initial population: 'random' or 'dsatur' (graph-colouring seeding)
+        self.seeding = 'random'
+        self._seeder = None
+        self._valid_days = {}
+        
+        # Memetic mode: moves tried per individual by local_search
+        self.local_search_moves = 100
+        
+        # Crossover operator and the number of exams the greedy repair after
+        # crossover may move per child (0: no repair)
+        self.crossover = 'two_point'
+        self.crossover_repair = 0
         
         # Create encoded lists for mutation
         self.encoded_courses, self.encoded_time_slots, self.encoded_halls = create_encoded_lists(
-            self.exams, self.time_slots, self.rooms
+            range(self.instance.num_exams), self.time_slots, range(self.instance.num_rooms)
         )
     
-    def genetic_algorithm(self, population, max_generation, optimalFitness, mutation_rate=0.1):
+    @property
+    def seeder(self):
+        """DSatur seeder, built on first use (also the timeslot windows per exam length)"""
+        if self._seeder is None:
+            self._seeder = Seeder(self.fitness_engine)
+        return self._seeder
+    
+    def genetic_algorithm(self, population, max_generation, optimalFitness, mutation_rate=0.1, guided_mutation=False,
+                          workers=None, conflict_directed=False, time_limit=None, stagnation_limit=None,
+                          callback=None, checkpoint_path=None, checkpoint_interval=10, memetic=0,
+                          memetic_budget=0.1, replacement='generational', replacement_size=2):
+        """Evolve ``population``; returns ``(best_encoded, generation, best_decoded)``.
+
+        Stops at ``max_generation``, at ``optimalFitness``, after
+        ``time_limit`` seconds or ``stagnation_limit`` generations without
+        improvement, or when ``callback(progress)`` (called on every
+        improvement) returns True.  With ``checkpoint_path`` the run state
+        is saved there every ``checkpoint_interval`` generations (and when
+        it stops on its budget or generation limit); see ``resume``.
+        
+        With ``memetic`` > 0 the ``memetic`` fittest individuals of every
+        generation are improved by local_search before breeding, using at
+        most ``memetic_budget`` CPU seconds per generation.
+        
+        ``replacement`` picks how children replace the population (see
+        ``breed``): 'generational', 'elitism', 'steady_state' or
+        'mu_plus_lambda', with ``replacement_size`` elites or children.
+        """
+        progress = drive(self.genetic_algorithm_steps(population, max_generation, optimalFitness, mutation_rate,
+                                                      guided_mutation, workers, conflict_directed, time_limit,
+                                                      stagnation_limit, checkpoint_path, checkpoint_interval,
+                                                      memetic=memetic, memetic_budget=memetic_budget,
+                                                      replacement=replacement, replacement_size=replacement_size),
+                         callback)
+        return self._finish(progress.best, progress.fitness, progress.step)
+    
+    def resume(self, checkpoint_path, callback=None, **overrides):
+        """Continue a genetic_algorithm run from its checkpoint file.
+
+        The run picks up with the saved settings, exactly as if it had not
+        been interrupted; ``overrides`` replace saved settings, e.g. a
+        larger ``max_generation`` or a new ``time_limit``.
+        """
+        checkpoint = Checkpoint.load(checkpoint_path)
+        checkpoint.check(self, 'genetic_algorithm')
+        settings = {**checkpoint.settings, **overrides}
+        # GA parameters (crossover, ...) of the interrupted run
+        for name, value in settings.pop('parameters', {}).items():
+            setattr(self, name, value)
+        progress = drive(self.genetic_algorithm_steps(None, resume_from=checkpoint, **settings), callback)
+        if progress is None:
+            # Nothing left to run under these settings
+            return self._finish(checkpoint.best, checkpoint.best_fitness, checkpoint.step)
+        return self._finish(progress.best, progress.fitness, progress.step)
+    
+    def genetic_algorithm_steps(self, population, max_generation, optimalFitness, mutation_rate=0.1,
+                                guided_mutation=False, workers=None, conflict_directed=False, time_limit=None,
+                                stagnation_limit=None, checkpoint_path=None, checkpoint_interval=10,
+                                resume_from=None, memetic=0, memetic_budget=0.1, replacement='generational',
+                                replacement_size=2):
+        """Generator form of genetic_algorithm: yields a ``Progress`` after
+        every generation.  Closing it stops the run (and its pool).
+        ``resume_from`` is a Checkpoint to continue instead of ``population``."""
+        settings = {
+            'max_generation': max_generation, 'optimalFitness': optimalFitness, 'mutation_rate': mutation_rate,
+            'guided_mutation': guided_mutation, 'workers': workers, 'conflict_directed': conflict_directed,
+            'time_limit': time_limit, 'stagnation_limit': stagnation_limit,
+            'checkpoint_path': checkpoint_path, 'checkpoint_interval': checkpoint_interval,
+            'memetic': memetic, 'memetic_budget': memetic_budget,
+            'replacement': replacement, 'replacement_size': replacement_size,
+            'parameters': self._worker_settings(),
+        }
+        if replacement not in REPLACEMENTS:
+            raise ValueError(f"Unknown replacement: {replacement}")
+        if self.crossover not in CROSSOVERS:
+            raise ValueError(f"Unknown crossover: {self.crossover}")
+        budget = Budget(time_limit, stagnation_limit)
         best_individual = None
         best_fitness = float('-inf')
         best_decoded = None
-        
-        for generation in range(max_generation):
-            # Evaluate fitness for each individual
-            fitness_scores = []
-            for individual in population:
-                # Decode individual for fitness evaluation
-                decoded = decode_individual(individual, self.rooms, self.time_slots, self.exams)
-                fitness = self.get_fitness(decoded, self.exams)
-                fitness_scores.append(fitness)
+        first_generation = 0
+        fitness_scores = None  # scores of ``population`` carried over by the replacement, if any
+        
+        if resume_from is not None:
+            # Restore the run and breed the generation after the checkpoint
+            resume_from.restore_rng()
+            best_individual, best_fitness = resume_from.best, resume_from.best_fitness
+            budget.best_fitness, budget.stagnant = best_fitness, resume_from.stagnant
+            best_decoded = best_individual.decode(self.exams, self.rooms, self.time_slots)
+            self.record_conflicts(self.fitness_cache.report(best_individual, best_decoded))
+            population, fitness_scores = resume_from.population, resume_from.fitness_scores
+            first_generation = resume_from.step + 1
+            print(f"Resuming at generation {first_generation} (best fitness {best_fitness})")
+        else:
+            # Work on compact genomes; legacy string individuals are converted
+            population = [self.to_genome(individual) for individual in population]
+        
+        # Optional process pool for scoring whole populations
+        pool = create_pool(self, workers, settings=self._worker_settings())
+        
+        def score(genomes):
+            # Only genomes missing from the fitness cache are scored (on the pool if any)
+            with timer('ga.fitness'):
+                if pool is not None:
+                    scores = self.fitness_cache.score_all(
+                        genomes, lambda missing: score_population(pool, missing, workers))
+                else:
+                    scores = self.fitness_cache.score_all(genomes)
+            count('ga.evaluations', len(genomes))
+            return scores
+        
+        try:
+            if resume_from is not None:
+                # Breed the generation after the checkpoint
+                population, fitness_scores = self.breed(population, fitness_scores, mutation_rate, guided_mutation,
+                                                        conflict_directed, replacement, replacement_size, score)
             
-            # Track best individual
-            current_best = max(fitness_scores)
-            current_best_idx = fitness_scores.index(current_best)
-            
-            if current_best > best_fitness:
-                best_fitness = current_best
-                best_individual = population[current_best_idx]
-                best_decoded = decode_individual(best_individual, self.rooms, self.time_slots, self.exams)
-                # Get conflicts of best individual
-                self.get_fitness(best_decoded, self.exams)
-            
-            # Print generation info
-            print(f"Generation {generation}: Best Fitness = {current_best}")
+            for generation in range(first_generation, max_generation):
+                count('ga.generations')
                 
-            # Early termination if optimal fitness reached
-            if best_fitness >= optimalFitness:
-                break
-            
-            # Create new generation
-            new_population = []
-            while len(new_population) < len(population):
-                # Selection
-                parent1 = self.tournament_selection(population, fitness_scores, tournament_size=3)
-                parent2 = self.tournament_selection(population, fitness_scores, tournament_size=3)
+                # Evaluate fitness for each individual (survivors keep their scores)
+                if fitness_scores is None:
+                    fitness_scores = score(population)
                 
-                # Crossover
-                child1, child2 = self.two_point_crossover_timetable(parent1, parent2)
+                # Memetic mode: local search on the fittest individuals
+                if memetic:
+                    with timer('ga.local_search'):
+                        self.improve_fittest(population, fitness_scores, memetic, memetic_budget)
                 
-                # Mutation
-                if random.random() < mutation_rate:
-                    child1 = self.mutate_timetable(child1)
-                if random.random() < mutation_rate:
-                    child2 = self.mutate_timetable(child2)
+                # Track best individual
+                current_best = max(fitness_scores)
+                current_best_idx = fitness_scores.index(current_best)
                 
-                new_population.extend([child1, child2])
-            
-            # Ensure population size remains consistent
-            population = new_population[:len(population)]
-        
+                improved = budget.update(current_best)
+                if improved:
+                    best_fitness = current_best
+                    best_individual = population[current_best_idx]
+                    with timer('ga.decode'):
+                        best_decoded = best_individual.decode(self.exams, self.rooms, self.time_slots)
+                    # Get conflicts of best individual
+                    with timer('ga.conflict_report'):
+                        self.record_conflicts(self.fitness_cache.report(best_individual, best_decoded))
+                
+                # Print generation info
+                print(f"Generation {generation}: Best Fitness = {current_best}")
+                yield Progress(generation, best_individual, best_fitness, improved, budget.elapsed)
+                    
+                # Early termination if optimal fitness reached or out of budget
+                if best_fitness >= optimalFitness:
+                    break
+                reason = budget.exhausted()
+                
+                # Save the evaluated population before breeding from it
+                if checkpoint_path is not None and (reason or (generation + 1) % checkpoint_interval == 0
+                                                    or generation + 1 == max_generation):
+                    with timer('ga.checkpoint'):
+                        Checkpoint.capture(self, 'genetic_algorithm', generation, settings, best_individual,
+                                           best_fitness, budget.stagnant, population=population,
+                                           fitness_scores=fitness_scores).save(checkpoint_path)
+                
+                if reason:
+                    print(f"Stopping early: {reason}")
+                    break
+                
+                # Create new generation
+                population, fitness_scores = self.breed(population, fitness_scores, mutation_rate, guided_mutation,
+                                                        conflict_directed, replacement, replacement_size, score)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+    
+    def _finish(self, best_individual, best_fitness, generation):
+        """Final report of a run; returns ``(best_encoded, generation, best_decoded)``"""
         # Print final generation info
         print(f"Final Best Fitness: {best_fitness} at generation {generation}")
+        if self.fitness_cache.hits + self.fitness_cache.misses:
+            print(f"Fitness cache: {self.fitness_cache.summary()}")
         
         # Run fitness one last time on best individual to ensure conflict data is current
-        best_decoded = decode_individual(best_individual, self.rooms, self.time_slots, self.exams)
-        _ = self.get_fitness(best_decoded, self.exams)
+        # (the best individual's report is still cached)
+        best_decoded = best_individual.decode(self.exams, self.rooms, self.time_slots)
+        self.record_conflicts(self.fitness_cache.report(best_individual, best_decoded))
         
         # Print conflict statistics
         self.print_conflict_report()
         
-        return best_individual, generation, best_decoded
+        # Return the solution in the legacy string encoding
+        return best_individual.to_encoded(), generation, best_decoded
     
-    def print_conflict_report(self):
-        """Print detailed information about conflicts in the schedule"""
-        print("\n====== CONFLICT REPORT ======")
-        print(f"Total Student Conflicts: {len(self.student_conflicts)}")
-        print(f"Total Room Conflicts: {len(self.room_conflicts)}")
-        print(f"Total Capacity Issues: {len(self.capacity_issues)}")
-        print(f"Students with Multiple Exams per Day: {len(self.consecutive_exams)}")
-        print(f"Non-consecutive Timeslot Issues: {len(self.non_consecutive_slots)}")
-        
-        # Print all student conflicts
-        if self.student_conflicts:
-            print("\n----- STUDENT CONFLICTS -----")
-            for i, (student_id, date, timeslot_id, exam1, exam2) in enumerate(self.student_conflicts[:10], 1):
-                print(f"{i}. Student {student_id} has conflicting exams {exam1} and {exam2} on {date} at timeslot {timeslot_id}")
-            
-            if len(self.student_conflicts) > 10:
-                print(f"... and {len(self.student_conflicts) - 10} more conflicts")
-                
-            # Count conflicts per student
-            student_conflict_count = {}
-            for student_id, _, _, _, _ in self.student_conflicts:
-                student_conflict_count[student_id] = student_conflict_count.get(student_id, 0) + 1
-            
-            # Print students with most conflicts
-            most_conflicted = sorted(student_conflict_count.items(), key=lambda x: x[1], reverse=True)[:5]
-            if most_conflicted:
-                print("\nStudents with most conflicts:")
-                for student_id, count in most_conflicted:
-                    print(f"Student {student_id}: {count} conflicts")
-        
-        # Print room conflicts
-        if self.room_conflicts:
-            print("\n----- ROOM CONFLICTS -----")
-            for i, (room_id, date, timeslot_id, exam1, exam2) in enumerate(self.room_conflicts[:10], 1):
-                print(f"{i}. Room {room_id} double-booked for exams {exam1} and {exam2} on {date} at timeslot {timeslot_id}")
+    def breed(self, population, fitness_scores, mutation_rate=0.1, guided_mutation=False, conflict_directed=False,
+              replacement='generational', replacement_size=2, score=None):
+        """Next population and its fitness scores (None when it is still to be scored).
+
+        'generational' replaces the whole population with children,
+        'elitism' keeps the ``replacement_size`` fittest individuals and
+        fills the rest with children, 'steady_state' breeds
+        ``replacement_size`` children that replace the worst individuals,
+        and 'mu_plus_lambda' breeds as many children as there are parents
+        and keeps the fittest of both.  Survivors keep their scores, so only
+        the children are scored (with ``score``, default the fitness cache).
+        """
+        if replacement == 'generational':
+            return self.next_generation(population, fitness_scores, mutation_rate, guided_mutation,
+                                        conflict_directed), None
+        
+        size = len(population)
+        if replacement == 'elitism':
+            num_children = size - min(replacement_size, size)
+        elif replacement == 'steady_state':
+            num_children = min(replacement_size, size)
+        elif replacement == 'mu_plus_lambda':
+            num_children = size
+        else:
+            raise ValueError(f"Unknown replacement: {replacement}")
+        children = self.next_generation(population, fitness_scores, mutation_rate, guided_mutation,
+                                        conflict_directed, num_children)
+        child_scores = (score or self.fitness_cache.score_all)(children)
+        
+        # Fittest first; on equal fitness parents before children (stable sort)
+        ranked = sorted(range(size), key=lambda i: -fitness_scores[i])
+        if replacement == 'elitism':
+            survivors = ranked[:size - num_children]
+        elif replacement == 'steady_state':
+            survivors = sorted(ranked[:size - num_children])
+        else:
+            pool = list(population) + children
+            pool_scores = list(fitness_scores) + child_scores
+            ranked = sorted(range(len(pool)), key=lambda i: -pool_scores[i])[:size]
+            return [pool[i] for i in ranked], [pool_scores[i] for i in ranked]
+        return ([population[i] for i in survivors] + children,
+                [fitness_scores[i] for i in survivors] + child_scores)
+    
+    def next_generation(self, population, fitness_scores, mutation_rate=0.1, guided_mutation=False,
+                        conflict_directed=False, size=None):
+        """Breed ``size`` children (default: as many as ``population``) by
+        selection, crossover and mutation"""
+        size = len(population) if size is None else size
+        new_population = []
+        while len(new_population) < size:
+            # Selection
+            with timer('ga.selection'):
+                parent1 = self.tournament_selection(population, fitness_scores, tournament_size=3)
+                parent2 = self.tournament_selection(population, fitness_scores, tournament_size=3)
             
-            if len(self.room_conflicts) > 10:
-                print(f"... and {len(self.room_conflicts) - 10} more room conflicts")
-        
-        # Print capacity issues
-        if self.capacity_issues:
-            print("\n----- CAPACITY ISSUES -----")
-            for i, (exam_id, needed, available) in enumerate(self.capacity_issues[:10], 1):
-                deficit = needed - available
-                print(f"{i}. Exam {exam_id} needs {needed} seats but only {available} available (deficit: {deficit})")
+            # Crossover
+            with timer('ga.crossover'):
+                child1, child2 = self.crossover_timetables(parent1, parent2)
             
-            if len(self.capacity_issues) > 10:
-                print(f"... and {len(self.capacity_issues) - 10} more capacity issues")
-        
-        # Print students with multiple exams in a day
-        if self.consecutive_exams:
-            print("\n----- MULTIPLE EXAMS PER DAY -----")
-            for i, (student_id, date, exams) in enumerate(self.consecutive_exams[:10], 1):
-                print(f"{i}. Student {student_id} has {len(exams)} exams on {date}: {', '.join(map(str, exams))}")
+            # Mutation (guided mutation rejects moves that worsen the child,
+            # conflict-directed mutation targets exams with student clashes)
+            with timer('ga.mutation'):
+                if random.random() < mutation_rate:
+                    child1 = self.mutate_child(child1, guided_mutation, conflict_directed)
+                    count('ga.mutations')
+                if random.random() < mutation_rate:
+                    child2 = self.mutate_child(child2, guided_mutation, conflict_directed)
+                    count('ga.mutations')
             
-            if len(self.consecutive_exams) > 10:
-                print(f"... and {len(self.consecutive_exams) - 10} more students with multiple exams per day")
+            new_population.extend([child1, child2])
         
-        print("\n==============================")
-        
-        return self.conflict_stats
-
-    def get_fitness(self, decoded_timetable, exams):
-        penalty = 0
-        student_schedule = {}  # (student_id, date, timeslot_id) -> exam_id
-        exams_by_date = {}     # date_str -> list of (exam, timeslots)
-        room_assignments = {}  # (timeslot, room) -> exam_id
-        
-        # Tracking conflict information
-        self.student_conflicts = []  # [(student_id, date, timeslot_id, exam1_id, exam2_id), ...]
-        self.room_conflicts = []     # [(room_id, date, timeslot_id, exam1_id, exam2_id), ...]
-        self.consecutive_exams = []  # [(student_id, date, [exam_ids]), ...]
-        self.capacity_issues = []    # [(exam_id, needed_capacity, available_capacity), ...]
-        self.non_consecutive_slots = [] # [(exam_id, [timeslot_ids]), ...]
-        
-        exam_dict = {exam.exam_id: exam for exam in exams}  # Faster lookup
-
-        # Core penalty weights
-        CAPACITY_WEIGHT = 20       # Penalty per student over capacity
-        ROOM_CONFLICT_WEIGHT = 40  # Room double-booking
-        STUDENT_CONFLICT_WEIGHT = 70  # Direct student conflict (increased from 50)
-        CONSECUTIVE_EXAMS_WEIGHT = 25  # Consecutive exams on same day (increased from 15)
-        TIMESLOT_CONSISTENCY_WEIGHT = 50  # Non-consecutive timeslots
-        DIFFICULTY_WEIGHT = 3      # Weight for difficulty balancing (increased from 2)
-        
-        # New penalties
-        WEEKEND_PENALTY = 10       # Penalty for scheduling on weekends
-        SPREAD_BONUS = -5          # Bonus for well-spread exams
+        # Ensure population size remains consistent
+        return new_population[:size]
+    
+    def island_model(self, population_size=20, islands=4, max_generation=100, optimalFitness=0,
+                     migration_interval=10, migrants=1, topology='ring', mutation_rate=0.1,
+                     guided_mutation=False, conflict_directed=False, workers=None, time_limit=None,
+                     stagnation_limit=None, callback=None):
+        """Island-model GA: ``islands`` sub-populations evolve independently
+        (in ``workers`` processes when given) and every ``migration_interval``
+        generations each sends copies of its ``migrants`` best individuals to
+        its neighbours, replacing their worst ones.  ``topology`` is 'ring'
+        (island i sends to i+1) or 'full' (every island sends to all others).
 
-        for assignment in decoded_timetable:
-            try:
-                exam = assignment['exam']
-                timeslots = assignment['timeslots']
-                rooms = assignment['rooms']
-                
-                # Skip if no timeslots or rooms
-                if not timeslots or not rooms:
-                    penalty += 200
-                    continue
-                
-                # 1. Check total room capacity with progressive penalty
-                total_capacity = sum(room.capacity for room in rooms)
-                capacity_deficit = len(exam.students) - total_capacity
-                if capacity_deficit > 0:
-                    # Progressive penalty: gets worse as deficit increases
-                    penalty += CAPACITY_WEIGHT * (capacity_deficit + (capacity_deficit ** 1.5) // 10)
-                    self.capacity_issues.append((exam.exam_id, len(exam.students), total_capacity))
-                
-                # 2. Check room double-booking with specific timeslot tracking
-                for timeslot in timeslots:
-                    for room in rooms:
-                        room_key = (timeslot.timeslot_id, room.room_id)
-                        if room_key in room_assignments:
-                            # If same exam, smaller penalty
-                            existing_exam_id = room_assignments[room_key]
-                            if existing_exam_id == exam.exam_id:
-                                penalty += ROOM_CONFLICT_WEIGHT // 2
-                            else:
-                                penalty += ROOM_CONFLICT_WEIGHT
-                                # Track the conflict
-                                self.room_conflicts.append((
-                                    room.room_id, 
-                                    timeslot.date_str, 
-                                    timeslot.timeslot_id, 
-                                    existing_exam_id, 
-                                    exam.exam_id
-                                ))
-                        else:
-                            room_assignments[room_key] = exam.exam_id
-                
-                # 3. Check student conflicts with improved handling
-                for student in exam.students:
-                    # Track all of this student's exams for better conflict analysis
-                    student_exams_by_date = {}
-                    
-                    for timeslot in timeslots:
-                        key = (student.student_id, timeslot.date_str, timeslot.timeslot_id)
-                        
-                        # Direct conflict check
-                        if key in student_schedule:
-                            existing_exam = student_schedule[key]
-                            if existing_exam != exam.exam_id:  # Different exams
-                                penalty += STUDENT_CONFLICT_WEIGHT
-                                # Track the conflict
-                                self.student_conflicts.append((
-                                    student.student_id, 
-                                    timeslot.date_str, 
-                                    timeslot.timeslot_id,
-                                    existing_exam, 
-                                    exam.exam_id
-                                ))
-                        else:
-                            student_schedule[key] = exam.exam_id
-                        
-                        # Track by date for consecutive exam check
-                        if timeslot.date_str not in student_exams_by_date:
-                            student_exams_by_date[timeslot.date_str] = []
-                        
-                        if exam.exam_id not in student_exams_by_date[timeslot.date_str]:
-                            student_exams_by_date[timeslot.date_str].append(exam.exam_id)
-                    
-                    # Check for multiple exams on same day - with progressive penalty
-                    for date, day_exams in student_exams_by_date.items():
-                        if len(day_exams) > 1:
-                            # Progressive penalty: 1->0, 2->25, 3->75, 4->150...
-                            penalty += CONSECUTIVE_EXAMS_WEIGHT * (len(day_exams) - 1) ** 2
-                            # Track the consecutive exams
-                            self.consecutive_exams.append((student.student_id, date, day_exams))
-                
-                # 4. Check if timeslots are consecutive and on same day
-                if len(timeslots) > 1:
-                    # Verify slots are consecutive and on same day
-                    consecutive_slots = True
-                    expected_ids = [timeslots[0].timeslot_id]
-                    base_date = timeslots[0].date
-                    
-                    for i in range(1, len(timeslots)):
-                        # Check if IDs are consecutive
-                        if timeslots[i].timeslot_id != expected_ids[-1] + 1:
-                            consecutive_slots = False
-                        
-                        # Check if all timeslots are on the same day
-                        if timeslots[i].date != base_date:
-                            consecutive_slots = False
-                        
-                        expected_ids.append(timeslots[i].timeslot_id)
-                    
-                    if not consecutive_slots:
-                        penalty += TIMESLOT_CONSISTENCY_WEIGHT
-                        self.non_consecutive_slots.append((
-                            exam.exam_id, [ts.timeslot_id for ts in timeslots]
-                        ))
-                
-                # Track exams by date for difficulty balancing
-                if timeslots and timeslots[0].date_str not in exams_by_date:
-                    exams_by_date[timeslots[0].date_str] = []
+        Each island reseeds its RNG per epoch from the main RNG, so results
+        do not depend on the number of workers.  ``time_limit``,
+        ``stagnation_limit`` and ``callback`` work as in genetic_algorithm
+        but are checked between epochs.  Returns the same
+        ``(best_encoded, generation, best_decoded)`` as genetic_algorithm.
+        """
+        progress = drive(self.island_model_steps(population_size, islands, max_generation, optimalFitness,
+                                                 migration_interval, migrants, topology, mutation_rate,
+                                                 guided_mutation, conflict_directed, workers, time_limit,
+                                                 stagnation_limit), callback)
+        return self._finish(progress.best, progress.fitness, progress.step)
+    
+    def island_model_steps(self, population_size=20, islands=4, max_generation=100, optimalFitness=0,
+                           migration_interval=10, migrants=1, topology='ring', mutation_rate=0.1,
+                           guided_mutation=False, conflict_directed=False, workers=None, time_limit=None,
+                           stagnation_limit=None):
+        """Generator form of island_model: yields a ``Progress`` after every epoch"""
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"Unknown island topology: {topology}")
+        if self.crossover not in CROSSOVERS:
+            raise ValueError(f"Unknown crossover: {self.crossover}")
+        
+        budget = Budget(time_limit, stagnation_limit)
+        populations = [self.generate_population(population_size) for _ in range(islands)]
+        scores = [None] * islands
+        settings = (optimalFitness, mutation_rate, guided_mutation, conflict_directed)
+        best_individual = None
+        best_fitness = float('-inf')
+        
+        # Optional process pool; islands run one epoch per task
+        pool = create_pool(self, workers, settings=self._worker_settings())
+        
+        try:
+            generation = 0
+            while generation < max_generation:
+                epoch = min(migration_interval, max_generation - generation)
+                seeds = [random.getrandbits(64) for _ in range(islands)]
+                tasks = list(zip(populations, scores, seeds))
+                with timer('ga.island_epoch'):
+                    if pool is not None:
+                        results = run_island_epochs(pool, tasks, epoch, settings, workers)
+                    else:
+                        # Islands reseed the global RNG; keep the main sequence intact
+                        state = random.getstate()
+                        results = [self.run_island_epoch(population, island_scores, seed, epoch, *settings)
+                                   for population, island_scores, seed in tasks]
+                        random.setstate(state)
                 
-                if timeslots:
-                    # Check for weekend penalty
-                    if timeslots[0].date.weekday() >= 5:  # 5=Saturday, 6=Sunday
-                        penalty += WEEKEND_PENALTY
-                    
-                    exams_by_date[timeslots[0].date_str].append((exam, timeslots))
+                populations = [result[0] for result in results]
+                scores = [result[1] for result in results]
+                generations_run = max(result[4] for result in results)
+                generation += generations_run
+                for _, _, island_best, island_fitness, _ in results:
+                    if island_fitness > best_fitness:
+                        best_fitness = island_fitness
+                        best_individual = island_best
+                improved = budget.update(best_fitness, steps=generations_run)
                 
-            except (KeyError, AttributeError) as e:
-                penalty += 150  # Severe penalty for invalid data
-        
-        # 5. Improved difficulty balancing with progressive penalty
-        for date, date_exams in exams_by_date.items():
-            if len(date_exams) > 1:
-                total_difficulty = sum(exam.difficulty for exam, _ in date_exams)
-                avg_difficulty = total_difficulty / len(date_exams)
+                print(f"Generation {generation}: Best Fitness = {best_fitness} "
+                      f"(islands: {', '.join(str(max(s)) for s in scores)})")
+                yield Progress(generation, best_individual, best_fitness, improved, budget.elapsed)
                 
-                # Apply penalty if average difficulty too high
-                if avg_difficulty > 3.5:
-                    penalty += DIFFICULTY_WEIGHT * (avg_difficulty - 3.5) ** 2 * len(date_exams)
+                if best_fitness >= optimalFitness or generation >= max_generation:
+                    break
+                reason = budget.exhausted()
+                if reason:
+                    print(f"Stopping early: {reason}")
+                    break
                 
-                # Apply higher penalty if total difficulty too high
-                if total_difficulty > 15:
-                    penalty += DIFFICULTY_WEIGHT * (total_difficulty - 15)
-        
-        # 6. Check for good exam spread (bonus)
-        if exams_by_date:
-            num_days_used = len(exams_by_date)
-            total_possible_days = len(set(ts.date_str for ts in self.time_slots))
-            spread_ratio = num_days_used / total_possible_days
-            
-            # Give bonus for using more days (better spread)
-            if spread_ratio > 0.7:
-                penalty += SPREAD_BONUS * int(spread_ratio * 10)
-        
-        # Store conflict statistics
-        self.conflict_stats = {
-            'student_conflicts': len(self.student_conflicts),
-            'room_conflicts': len(self.room_conflicts),
-            'consecutive_exams': len(self.consecutive_exams),
-            'capacity_issues': len(self.capacity_issues),
-            'non_consecutive_slots': len(self.non_consecutive_slots)
+                # Migration between epochs
+                with timer('ga.migration'):
+                    self.migrate(populations, scores, migrants, topology)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+    
+    def _worker_settings(self):
+        """GA parameters copied onto the solvers in worker processes"""
+        return {
+            'crossover': self.crossover,
+            'crossover_repair': self.crossover_repair,
         }
-        
-        return -penalty  # Higher is better
+    
+    def run_island_epoch(self, population, fitness_scores, seed, generations, optimalFitness,
+                         mutation_rate=0.1, guided_mutation=False, conflict_directed=False):
+        """Evolve one island for up to ``generations`` generations.
 
-    def mutate_timetable(self, individual):
-        mutated = individual.copy()
-        if not mutated:
-            return mutated
+        ``fitness_scores`` may be None when the population is not evaluated
+        yet.  Returns ``(population, fitness_scores, best_individual,
+        best_fitness, generations_run)`` with the final population evaluated.
+        """
+        random.seed(seed)
+        best_individual = None
+        best_fitness = float('-inf')
+        generations_run = 0
+        
+        for _ in range(generations + 1):
+            if fitness_scores is None:
+                with timer('ga.fitness'):
+                    fitness_scores = self.fitness_cache.score_all(population)
+                count('ga.evaluations', len(population))
+            
+            current_best = max(fitness_scores)
+            if current_best > best_fitness:
+                best_fitness = current_best
+                best_individual = population[fitness_scores.index(current_best)]
+            
+            if generations_run == generations or best_fitness >= optimalFitness:
+                break
             
-        # Pick a random assignment to mutate
-        index = random.randint(0, len(mutated) - 1)
+            count('ga.generations')
+            population = self.next_generation(population, fitness_scores, mutation_rate, guided_mutation,
+                                              conflict_directed)
+            fitness_scores = None
+            generations_run += 1
         
-        # Parse the assignment
-        parts = mutated[index].split('-')
-        if len(parts) != 3:
+        return population, fitness_scores, best_individual, best_fitness, generations_run
+    
+    def migrate(self, populations, scores, migrants, topology):
+        """Copy each island's best individuals over its worst ones on the
+        receiving islands (in place); migrants keep their known fitness."""
+        islands = len(populations)
+        if islands < 2 or migrants <= 0:
+            return
+        
+        # Pick all emigrants before any island is modified
+        outgoing = []
+        for population, island_scores in zip(populations, scores):
+            ranked = sorted(range(len(population)), key=lambda i: island_scores[i], reverse=True)
+            outgoing.append([(population[i], island_scores[i]) for i in ranked[:migrants]])
+        
+        for target in range(islands):
+            if topology == 'ring':
+                sources = [(target - 1) % islands]
+            else:
+                sources = [source for source in range(islands) if source != target]
+            incoming = [migrant for source in sources for migrant in outgoing[source]]
+            
+            population, island_scores = populations[target], scores[target]
+            worst = sorted(range(len(population)), key=lambda i: island_scores[i])
+            for slot, (individual, fitness) in zip(worst, incoming):
+                population[slot] = individual.copy()
+                island_scores[slot] = fitness
+    
+    def to_genome(self, individual):
+        """Return ``individual`` as a Genome, converting legacy string lists"""
+        if isinstance(individual, Genome):
+            return individual
+        return Genome.from_encoded(individual, self.instance.num_exams, len(self.time_slots), self.instance.num_rooms)
+    
+    def evaluate_individual(self, individual):
+        """Fitness of one genome (memoized)"""
+        return self.fitness_cache.score(individual)
+    
+    def mutate_child(self, child, guided_mutation=False, conflict_directed=False):
+        """Mutated ``child``; with ``guided_mutation`` the mutation is
+        rejected when it lowers the child's fitness.
+
+        Both fitness scores go through the fitness cache, so the child that
+        is kept is not evaluated again when its generation is scored.
+        """
+        mutated = self.mutate_timetable(child, conflict_directed)
+        if guided_mutation and self.fitness_cache.score(mutated) < self.fitness_cache.score(child):
+            return child
+        return mutated
+    
+    def mutate_timetable(self, individual, conflict_directed=False):
+        """Mutate one exam's timeslots and/or rooms.  With
+        ``conflict_directed`` the exam is drawn from those sharing a
+        timeslot with an overlapping exam, when there are any."""
+        mutated = individual.copy()
+        if not len(mutated):
             return mutated
             
-        exam_code = parts[0]
-        timeslot_parts = parts[1].split('+')
-        room_parts = parts[2].split('+')
+        # Pick a random exam to mutate
+        candidates = self.clashing_exams(mutated) if conflict_directed else []
+        if len(candidates):
+            index = int(random.choice(candidates))
+        else:
+            index = random.randint(0, len(mutated) - 1)
+        start = int(mutated.start[index])
+        length = int(mutated.length[index])
+        room_parts = mutated.room_list(index)
+        max_timeslot = len(self.time_slots)
         
         # Choose what to mutate: timeslots, rooms, or both
         mutation_type = random.choice(["timeslots", "rooms", "both"])
         
         if mutation_type in ["timeslots", "both"]:
-            timeslot_action = random.choice(["add", "remove", "shift"]) if len(timeslot_parts) > 1 else random.choice(["add", "shift"])
+            timeslot_action = random.choice(["add", "remove", "shift"]) if length > 1 else random.choice(["add", "shift"])
             
-            if timeslot_action == "add" and len(timeslot_parts) < 3:  # Limit to 3 slots max
-                # Find the highest timeslot ID
-                highest_id = max([int(ts[2:]) for ts in timeslot_parts])
-                new_ts = f"TS{highest_id + 1}"
-                timeslot_parts.append(new_ts)
+            if timeslot_action == "add" and length < 3:  # Limit to 3 slots max
+                # Extend by the next timeslot
+                if start + length < max_timeslot:
+                    length += 1
                 
-            elif timeslot_action == "remove" and len(timeslot_parts) > 1:
-                # Remove a random timeslot
-                timeslot_to_remove = random.choice(timeslot_parts)
-                timeslot_parts.remove(timeslot_to_remove)
+            elif timeslot_action == "remove" and length > 1:
+                # Drop the first or last timeslot so the rest stay consecutive
+                if random.random() < 0.5:
+                    start += 1
+                length -= 1
                 
             elif timeslot_action == "shift":
-                # Shift all timeslots by +1 or -1
+                # Shift all timeslots by +1 or -1, staying within bounds
                 shift = random.choice([-1, 1])
-                max_timeslot_id = len(self.time_slots)
-                
-                new_timeslot_parts = []
-                for ts in timeslot_parts:
-                    current_id = int(ts[2:])
-                    new_id = current_id + shift
-                    
-                    # Ensure ID stays within bounds
-                    if 1 <= new_id <= max_timeslot_id:
-                        new_timeslot_parts.append(f"TS{new_id}")
-                    else:
-                        new_timeslot_parts.append(ts)  # Keep original if out of bounds
-                        
-                timeslot_parts = new_timeslot_parts
+                if 0 <= start + shift and start + shift + length <= max_timeslot:
+                    start += shift
         
         if mutation_type in ["rooms", "both"]:
             
@@ -383,28 +534,106 @@ class GeneticAlgorithm:
             
             if room_action == "add":
                 # Add a random room
-                new_room = f"R{random.randint(1, len(self.rooms))}"
+                new_room = random.randrange(self.instance.num_rooms)
                 if new_room not in room_parts:
                     room_parts.append(new_room)
                     
             elif room_action == "remove" and len(room_parts) > 1:
                 # Remove a random room
-                room_to_remove = random.choice(room_parts)
-                room_parts.remove(room_to_remove)
+                room_parts.remove(random.choice(room_parts))
                 
             elif room_action == "replace":
                 # Replace a random room
                 if room_parts:
-                    index_to_replace = random.randint(0, len(room_parts) - 1)
-                    room_parts[index_to_replace] = f"R{random.randint(1, len(self.rooms))}"
+                    room_parts[random.randint(0, len(room_parts) - 1)] = random.randrange(self.instance.num_rooms)
         
-        # Reconstruct the mutated assignment
-        new_timeslots_str = "+".join(timeslot_parts)
-        new_rooms_str = "+".join(room_parts)
-        mutated[index] = f"{exam_code}-{new_timeslots_str}-{new_rooms_str}"
+        mutated.set_slots(index, start, length)
+        mutated.set_rooms(index, room_parts)
         
         return mutated
 
+    def clashing_exams(self, individual):
+        """Exam indices sharing a timeslot with an exam they have students in common with"""
+        exam_idx, slot_ptr, slot_idx, _, _ = individual.layout()
+        return exam_idx[self.fitness_engine.conflict_graph.clashing_rows(exam_idx, slot_ptr, slot_idx)]
+
+    def improve_fittest(self, population, fitness_scores, top_k, cpu_budget):
+        """Memetic step: local search on the ``top_k`` fittest individuals,
+        replacing them and their scores in place, within ``cpu_budget``
+        CPU seconds in total"""
+        deadline = time.process_time() + cpu_budget
+        ranked = sorted(range(len(population)), key=fitness_scores.__getitem__, reverse=True)[:top_k]
+        for index in ranked:
+            if time.process_time() >= deadline:
+                break
+            improved, changed = self.local_search(population[index], deadline)
+            if changed:
+                population[index] = improved
+                fitness_scores[index] = self.fitness_cache.score(improved)
+                count('ga.local_search_improvements')
+    
+    def local_search(self, individual, deadline=None, moves=None):
+        """Hill climb on a copy of ``individual``; returns ``(genome, improved)``.
+
+        Each move sends one exam (half the time one sharing a timeslot with
+        an overlapping exam, when there are any) to a random same-day
+        timeslot window of its required length, in the least-waste room set
+        free there.  Moves are scored incrementally and kept only if they
+        lower the penalty.  Stops after ``moves`` tries (default
+        ``local_search_moves``) or at the ``time.process_time()`` ``deadline``.
+        """
+        improved = individual.copy()
+        evaluator = IncrementalEvaluator(self.fitness_engine).load_genome(improved)
+        room_load = evaluator.room_load.reshape(len(self.time_slots), self.instance.num_rooms)
+        room_packer = self.fitness_engine.room_packer
+        enrollment = self.instance.enrollment
+        seeder = self.seeder
+        clashing = self.clashing_exams(improved).tolist()
+        changed = False
+        
+        for _ in range(self.local_search_moves if moves is None else moves):
+            if deadline is not None and time.process_time() >= deadline:
+                break
+            if clashing and random.random() < 0.5:
+                exam = random.choice(clashing)
+            else:
+                exam = random.randrange(self.instance.num_exams)
+            windows = seeder.windows[int(seeder.required[exam])]
+            slots = windows[random.randrange(len(windows))].tolist()
+            
+            # Least-waste rooms among those other exams leave free in the window
+            old_slots, old_rooms = evaluator.slots[exam], list(evaluator.rooms[exam])
+            load = room_load[slots]
+            for row, slot in enumerate(slots):
+                if slot in old_slots:
+                    load[row, old_rooms] -= 1
+            rooms = room_packer.best(enrollment[exam], (load > 0).any(axis=0))
+            
+            if evaluator.delta(exam, slots, rooms) < 0:
+                evaluator.move(exam, slots, rooms)
+                improved.set_slots(exam, slots[0], len(slots))
+                improved.set_rooms(exam, rooms)
+                changed = True
+        return improved, changed
+    
+    def crossover_timetables(self, parent1, parent2):
+        """Two children of ``parent1`` and ``parent2`` by the ``crossover``
+        operator ('two_point', 'day' or 'conflict_uniform'), each greedily
+        repaired when ``crossover_repair`` is set"""
+        if self.crossover == 'two_point':
+            children = self.two_point_crossover_timetable(parent1, parent2)
+        elif self.crossover == 'day':
+            children = self.day_crossover(parent1, parent2)
+        elif self.crossover == 'conflict_uniform':
+            children = self.conflict_uniform_crossover(parent1, parent2)
+        else:
+            raise ValueError(f"Unknown crossover: {self.crossover}")
+        
+        if self.crossover_repair:
+            with timer('ga.repair'):
+                children = tuple(self.repair_timetable(child, self.crossover_repair) for child in children)
+        return children
+    
     def two_point_crossover_timetable(self, parent1, parent2):
         # Ensure parents have at least 2 exams for meaningful crossover
         if len(parent1) < 2 or len(parent2) < 2:
@@ -413,18 +642,115 @@ class GeneticAlgorithm:
         # Make sure crossover points are within valid range
         min_length = min(len(parent1), len(parent2))
         
-        # Select first crossover point (avoiding first and last positions)
-        crossover_point1 = random.randint(1, min_length - 2)
+        # Select first crossover point (avoiding first and last positions;
+        # with two exams the segment is the second one)
+        crossover_point1 = random.randint(1, max(1, min_length - 2))
         
         # Select second crossover point after the first one
-        crossover_point2 = random.randint(crossover_point1 + 1, min_length - 1)
+        crossover_point2 = random.randint(crossover_point1 + 1, max(crossover_point1 + 1, min_length - 1))
         
         # Create children by swapping middle segments
-        child1 = parent1[:crossover_point1] + parent2[crossover_point1:crossover_point2] + parent1[crossover_point2:]
-        child2 = parent2[:crossover_point1] + parent1[crossover_point1:crossover_point2] + parent2[crossover_point2:]
+        segment = slice(crossover_point1, crossover_point2)
+        child1, child2 = parent1.copy(), parent2.copy()
+        for child, donor in ((child1, parent2), (child2, parent1)):
+            child.start[segment] = donor.start[segment]
+            child.length[segment] = donor.length[segment]
+            child.rooms[segment] = donor.rooms[segment]
         
         return child1, child2
 
+    def day_crossover(self, parent1, parent2):
+        """Day-based crossover: for a random half of the exam days, each
+        child takes the exams the other parent holds on those days, with
+        their timeslots and rooms, so whole days of a timetable are
+        inherited together"""
+        slot_day = self.fitness_engine.slot_day
+        chosen = np.array([random.random() < 0.5 for _ in range(self.fitness_engine.num_days)])
+        child1, child2 = parent1.copy(), parent2.copy()
+        for child, donor in ((child1, parent2), (child2, parent1)):
+            take = chosen[slot_day[donor.start]] & (donor.length > 0)
+            child.start[take] = donor.start[take]
+            child.length[take] = donor.length[take]
+            child.rooms[take] = donor.rooms[take]
+        return child1, child2
+    
+    def conflict_uniform_crossover(self, parent1, parent2):
+        """Uniform crossover guided by the exam conflict graph.
+
+        Exams are visited in random order and take their placement from a
+        random parent, unless it shares a timeslot with a conflicting exam
+        already placed in the child while the other parent's does not.
+        """
+        neighbours = self.fitness_engine.conflict_graph.neighbours
+        num_exams = len(parent1)
+        children = []
+        for first, second in ((parent1, parent2), (parent2, parent1)):
+            child = first.copy()
+            busy = np.zeros((num_exams, len(self.time_slots)), dtype=bool)  # timeslots of placed exams
+            for exam in random.sample(range(num_exams), num_exams):
+                donor, other = (first, second) if random.random() < 0.5 else (second, first)
+                slots = donor.slots(exam)
+                if (donor.start[exam] != other.start[exam] or donor.length[exam] != other.length[exam]) \
+                        and busy[neighbours[exam]][:, slots].any() \
+                        and not busy[neighbours[exam]][:, other.slots(exam)].any():
+                    donor = other
+                    slots = donor.slots(exam)
+                child.start[exam] = donor.start[exam]
+                child.length[exam] = donor.length[exam]
+                child.rooms[exam] = donor.rooms[exam]
+                busy[exam, slots] = True
+            children.append(child)
+        return tuple(children)
+    
+    def repair_timetable(self, individual, limit):
+        """Greedy repair after crossover on a copy of ``individual``.
+
+        Up to ``limit`` exams sharing a timeslot with an overlapping exam
+        (in random order) are each moved to the same-day timeslot window of
+        their required length that lowers the penalty most, if any does.
+        All windows are scored in one ``placement_deltas`` call with the
+        exam's least-waste room set; the best few are scored again with the
+        least-waste set of the rooms free there.
+        """
+        repaired = individual.copy()
+        clashing = self.clashing_exams(repaired).tolist()
+        if not clashing:
+            return repaired
+        evaluator = IncrementalEvaluator(self.fitness_engine).load_genome(repaired)
+        room_load = evaluator.room_load.reshape(len(self.time_slots), self.instance.num_rooms)
+        room_packer = self.fitness_engine.room_packer
+        
+        for exam in random.sample(clashing, min(limit, len(clashing))):
+            slots, rooms = evaluator.slots[exam], evaluator.rooms[exam]
+            if not slots:
+                continue
+            needed = self.instance.enrollment[exam]
+            windows = self.seeder.windows[int(self.seeder.required[exam])]
+            
+            # Take the exam out and score every window with its best room set
+            removed = evaluator.move(exam, (), ())
+            room_sets = [room_packer.best(needed)]
+            candidates = [(w, 0) for w in range(len(windows))]
+            
+            # Then the most promising windows with the rooms still free there
+            occupied = room_load[windows].any(axis=1)
+            first = evaluator.placement_deltas(exam, windows, room_packer.room_masks(room_sets), candidates)
+            for w in np.argsort(first, kind='stable')[:3].tolist():
+                room_sets.append(room_packer.best(needed, occupied[w]))
+                candidates.append((w, len(room_sets) - 1))
+            second = evaluator.placement_deltas(exam, windows, room_packer.room_masks(room_sets),
+                                                candidates[len(windows):])
+            deltas = np.concatenate((first, second))
+            
+            best = int(np.argmin(deltas))
+            if deltas[best] + removed < 0:
+                w, r = candidates[best]
+                slots, rooms = windows[w].tolist(), room_sets[r]
+                repaired.set_slots(exam, slots[0], len(slots))
+                repaired.set_rooms(exam, rooms)
+            evaluator.move(exam, slots, rooms)
+        return repaired
+    
     def tournament_selection(self, population, fitness_scores, tournament_size):
         # Select a random subset of individuals for the tournament
         tournament_indices = random.sample(range(len(population)), tournament_size)
@@ -442,26 +768,17 @@ class GeneticAlgorithm:
         if required_slots <= 1:
             return [random.choice(self.time_slots)]
         
-        # Group timeslots by date
-        timeslots_by_date = {}
-        for ts in self.time_slots:
-            if ts.date_str not in timeslots_by_date:
-                timeslots_by_date[ts.date_str] = []
-            timeslots_by_date[ts.date_str].append(ts)
-        
-        # Sort timeslots by ID for each date
-        for date, slots in timeslots_by_date.items():
-            timeslots_by_date[date] = sorted(slots, key=lambda ts: ts.timeslot_id)
-        
-        # Randomly select a date that has enough slots
-        valid_dates = [date for date, slots in timeslots_by_date.items() 
-                      if len(slots) >= required_slots]
+        # Randomly select a date that has enough slots (the calendar keeps
+        # each day's slot indices in timeslot id order; grouped once per length)
+        valid_days = self._valid_days.get(required_slots)
+        if valid_days is None:
+            valid_days = [slots for slots in self.calendar.day_slots if len(slots) >= required_slots]
+            self._valid_days[required_slots] = valid_days
         
-        if not valid_dates:
+        if not valid_days:
             return [random.choice(self.time_slots)]  # Fallback if no valid dates
         
-        selected_date = random.choice(valid_dates)
-        slots = timeslots_by_date[selected_date]
+        slots = [self.time_slots[t] for t in random.choice(valid_days)]
         
         # Find a starting position that allows for consecutive slots
         max_start_idx = len(slots) - required_slots
@@ -471,18 +788,35 @@ class GeneticAlgorithm:
         start_idx = random.randint(0, max_start_idx)
         return slots[start_idx:start_idx + required_slots]
 
-    def generate_population(self, population_size=50):
+    def generate_population(self, population_size=50, seeding=None):
+        """Initial population of genomes.
+
+        ``seeding`` (default: the ``seeding`` attribute) is 'random' (random
+        timeslots and rooms per exam) or 'dsatur' (graph-colouring seeds
+        from ``seeding.Seeder``, near-feasible from the start).
+        """
+        seeding = seeding or self.seeding
+        if seeding == 'dsatur':
+            return [self.seeder.genome() for _ in range(population_size)]
+        if seeding != 'random':
+            raise ValueError(f"Unknown seeding: {seeding}")
+        
         population = []
+        slot_index = self.fitness_engine.slot_index
+        enrollment = self.instance.enrollment.tolist()
+        duration = self.instance.duration.tolist()
+        capacity = self.instance.capacity.tolist()
+        by_capacity = self.instance.rooms_by_capacity()
         
         for _ in range(population_size):
-            individual = []
-            for exam in self.exams:
+            individual = Genome.empty(self.instance.num_exams, self.instance.num_rooms)
+            for exam_index in range(self.instance.num_exams):
                 # Determine how many rooms this exam needs
-                students_count = len(exam.students)
-                available_rooms = sorted(self.rooms, key=lambda r: r.capacity, reverse=True)
+                students_count = enrollment[exam_index]
+                available_rooms = list(by_capacity)
                 
                 # Calculate how many time slots we need based on exam duration
-                required_slots = max(1, exam.duration // 120)  # Assuming 2 hours per slot
+                required_slots = max(1, duration[exam_index] // 120)  # Assuming 2 hours per slot
                 
                 # Find consecutive time slots on the same day
                 consecutive_slots = self.get_consecutive_timeslots(required_slots)
@@ -497,18 +831,15 @@ class GeneticAlgorithm:
                     available_rooms.remove(room)
                     
                     assigned_rooms.append(room)
-                    remaining_students -= room.capacity
+                    remaining_students -= capacity[room]
                     
                     if remaining_students <= 0 or not available_rooms:
                         break
                 
-                # Create assignment string with multiple rooms and timeslots
-                room_str = "+".join([f"R{room.room_id}" for room in assigned_rooms])
-                timeslot_str = "+".join([f"TS{ts.timeslot_id}" for ts in consecutive_slots])
-                assignment = f"C{self.exams.index(exam)+1}-{timeslot_str}-{room_str}"
-                individual.append(assignment)
+                # Record the consecutive timeslots and rooms in the genome
+                individual.set_slots(exam_index, slot_index[consecutive_slots[0].timeslot_id], len(consecutive_slots))
+                individual.set_rooms(exam_index, assigned_rooms)
             
             population.append(individual)
         
         return population
-
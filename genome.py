@@ -0,0 +1,169 @@
+import hashlib
+
+import numpy as np
+
+from encoder import parse_assignment
+
+
+class Genome:
+    """Compact chromosome: one row per exam, in exam order.
+
+    ``start`` holds the index of each exam's first timeslot, ``length`` the
+    number of consecutive timeslots it uses and ``rooms`` a packed bitmask
+    (little-endian bit order) of the room indices assigned to it.  An exam
+    with no timeslots or no rooms is unscheduled.
+    """
+
+    __slots__ = ('start', 'length', 'rooms', 'num_rooms')
+
+    def __init__(self, start, length, rooms, num_rooms):
+        self.start = start
+        self.length = length
+        self.rooms = rooms
+        self.num_rooms = num_rooms
+
+    @classmethod
+    def empty(cls, num_exams, num_rooms):
+        return cls(
+            np.zeros(num_exams, dtype=np.int32),
+            np.zeros(num_exams, dtype=np.int8),
+            np.zeros((num_exams, (num_rooms + 7) // 8), dtype=np.uint8),
+            num_rooms,
+        )
+
+    def __len__(self):
+        return len(self.start)
+
+    def copy(self):
+        return Genome(self.start.copy(), self.length.copy(), self.rooms.copy(), self.num_rooms)
+
+    def key(self):
+        """Bytes that identify this genome's contents"""
+        return self.start.tobytes() + self.length.tobytes() + self.rooms.tobytes()
+
+    def digest(self):
+        """16-byte BLAKE2b hash of ``key()``, a compact identity for caching"""
+        digest = hashlib.blake2b(self.start.tobytes(), digest_size=16)
+        digest.update(self.length.tobytes())
+        digest.update(self.rooms.tobytes())
+        return digest.digest()
+
+    # ---- Per-exam access ----
+
+    def slots(self, exam):
+        """Timeslot indices of an exam"""
+        start = int(self.start[exam])
+        return range(start, start + int(self.length[exam]))
+
+    def room_list(self, exam):
+        """Room indices of an exam"""
+        bits = np.unpackbits(self.rooms[exam], bitorder='little')[:self.num_rooms]
+        return np.flatnonzero(bits).tolist()
+
+    def has_room(self, exam, room):
+        return bool(self.rooms[exam, room >> 3] & (1 << (room & 7)))
+
+    def set_slots(self, exam, start, length):
+        self.start[exam] = start
+        self.length[exam] = length
+
+    def set_rooms(self, exam, rooms):
+        self.rooms[exam] = 0
+        for room in rooms:
+            self.add_room(exam, room)
+
+    def add_room(self, exam, room):
+        self.rooms[exam, room >> 3] |= 1 << (room & 7)
+
+    def remove_room(self, exam, room):
+        self.rooms[exam, room >> 3] &= ~np.uint8(1 << (room & 7))
+
+    def placement(self, exam):
+        """``(slot_indices, room_indices)`` of an exam"""
+        return list(self.slots(exam)), self.room_list(exam)
+
+    # ---- Whole-timetable views ----
+
+    def room_matrix(self):
+        """Boolean exam x room assignment matrix"""
+        return np.unpackbits(self.rooms, axis=1, bitorder='little')[:, :self.num_rooms].astype(bool)
+
+    def layout(self):
+        """Flat index arrays ``(exam_idx, slot_ptr, slot_idx, room_ptr, room_idx)``
+        of the scheduled exams, as used by ``FitnessEngine.score``."""
+        matrix = self.room_matrix()
+        room_counts = matrix.sum(axis=1)
+        scheduled = (self.length > 0) & (room_counts > 0)
+        exam_idx = np.flatnonzero(scheduled)
+
+        slot_counts = self.length[scheduled].astype(np.int64)
+        slot_ptr = np.zeros(len(exam_idx) + 1, dtype=np.int64)
+        np.cumsum(slot_counts, out=slot_ptr[1:])
+        offsets = np.arange(slot_ptr[-1]) - np.repeat(slot_ptr[:-1], slot_counts)
+        slot_idx = np.repeat(self.start[scheduled].astype(np.int64), slot_counts) + offsets
+
+        room_ptr = np.zeros(len(exam_idx) + 1, dtype=np.int64)
+        np.cumsum(room_counts[scheduled], out=room_ptr[1:])
+        room_idx = np.nonzero(matrix[scheduled])[1].astype(np.int64)
+        return exam_idx, slot_ptr, slot_idx, room_ptr, room_idx
+
+    def cells(self, shape):
+        """Flat indices into an [exam, timeslot, room] array of ``shape`` for
+        every timeslot/room pair of every scheduled exam."""
+        exam_idx, slot_ptr, slot_idx, room_ptr, room_idx = self.layout()
+        slot_counts = np.diff(slot_ptr)
+        room_counts = np.diff(room_ptr)
+        pair_counts = slot_counts * room_counts
+        pair_ptr = np.zeros(len(exam_idx) + 1, dtype=np.int64)
+        np.cumsum(pair_counts, out=pair_ptr[1:])
+        row = np.repeat(np.arange(len(exam_idx)), pair_counts)
+        local = np.arange(pair_ptr[-1]) - pair_ptr[row]
+        slots = slot_idx[slot_ptr[row] + local // room_counts[row]]
+        rooms = room_idx[room_ptr[row] + local % room_counts[row]]
+        return np.ravel_multi_index((exam_idx[row], slots, rooms), shape)
+
+    def assignments(self):
+        """``(exam_idx, slot_indices, room_indices)`` of every scheduled exam"""
+        matrix = self.room_matrix()
+        return [
+            (exam, list(self.slots(exam)), np.flatnonzero(matrix[exam]).tolist())
+            for exam in range(len(self))
+            if self.length[exam] > 0 and matrix[exam].any()
+        ]
+
+    def decode(self, exams, rooms, timeslots):
+        """Decoded timetable (list of assignment dicts), like decode_individual"""
+        return [
+            {'exam': exams[exam],
+             'timeslots': [timeslots[t] for t in slots],
+             'rooms': [rooms[r] for r in room_list]}
+            for exam, slots, room_list in self.assignments()
+        ]
+
+    # ---- Legacy string encoding ----
+
+    @classmethod
+    def from_encoded(cls, encoded_individual, num_exams, num_timeslots, num_rooms):
+        """Build a genome from "C1-TS1+TS2-R1+R2" strings.
+
+        Each exam keeps its first timeslot and its number of timeslots, so
+        non-consecutive timeslot lists become consecutive, and repeated
+        rooms collapse into one.
+        """
+        genome = cls.empty(num_exams, num_rooms)
+        for item in encoded_individual:
+            parsed = parse_assignment(item, num_exams, num_timeslots, num_rooms)
+            if parsed is None:
+                continue
+            exam, slots, room_list = parsed
+            length = min(len(slots), num_timeslots - slots[0])
+            genome.set_slots(exam, slots[0], length)
+            genome.set_rooms(exam, room_list)
+        return genome
+
+    def to_encoded(self):
+        """Legacy "C1-TS1+TS2-R1+R2" strings of the scheduled exams"""
+        return [
+            f"C{exam + 1}-" + "+".join(f"TS{t + 1}" for t in slots) + "-" + "+".join(f"R{r + 1}" for r in room_list)
+            for exam, slots, room_list in self.assignments()
+        ]
@@ -0,0 +1,286 @@
+import csv
+import glob
+import hashlib
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+
+from exam import Exam
+from room import Room
+from student import Student
+
+
+# Bump when the cached array layout changes so old cache files are ignored
+CACHE_VERSION = 1
+CACHE_DIR = '.instance_cache'
+
+# Instances already loaded in this process, by source hash
+_loaded = {}
+
+# Array fields stored in a cache file
+_FIELDS = ('student_ids', 'student_names', 'exam_ids', 'course_names', 'duration', 'priority',
+           'student_ptr', 'student_idx', 'room_ids', 'room_names', 'capacity')
+_TEXT_FIELDS = ('student_names', 'course_names', 'room_names')
+
+
+class Instance:
+    """Columnar problem data: students, exams and rooms as flat arrays.
+
+    Enrollments are stored as a CSR exam x student matrix: the students of
+    exam ``e`` are the positions ``student_idx[student_ptr[e]:student_ptr[e+1]]``
+    into ``student_ids``.  The ``students``, ``exams`` and ``rooms`` lists of
+    Student/Exam/Room objects are only built the first time they are used
+    (decoding and reporting), so the solvers can run on the arrays alone.
+    """
+
+    def __init__(self, student_ids, student_names, exam_ids, course_names, duration, priority,
+                 student_ptr, student_idx, room_ids, room_names, capacity):
+        self.student_ids = student_ids      # int32 [students]
+        self.student_names = student_names  # list of str
+        self.exam_ids = exam_ids            # int32 [exams]
+        self.course_names = course_names    # list of str
+        self.duration = duration            # int32 [exams], minutes
+        self.priority = priority            # int32 [exams]
+        self.student_ptr = student_ptr      # int64 [exams + 1]
+        self.student_idx = student_idx      # int32 [enrollments]
+        self.room_ids = room_ids            # int32 [rooms]
+        self.room_names = room_names        # list of str
+        self.capacity = capacity            # int32 [rooms]
+        self._students = None
+        self._exams = None
+        self._rooms = None
+
+    @classmethod
+    def from_csv(cls, students_path='students.csv', exams_path='exams.csv', rooms_path='rooms.csv'):
+        """Stream the three CSV files into columnar arrays.
+
+        Rows are parsed one at a time and each exam's ``student_ids`` field
+        goes straight into an int32 array, so no per-enrollment Python
+        objects are kept.  Like ``Data.read_exams``, raises ValueError for
+        a ``student_ids`` field that is not a ';'-separated list of ids
+        (empty, or with an empty entry such as a trailing ';') and KeyError
+        for an enrollment of an unknown student.
+        """
+        student_ids, student_names = [], []
+        with open(students_path, mode='r', newline='') as file:
+            for row in csv.DictReader(file):
+                student_ids.append(int(row['id']))
+                student_names.append(row['name'])
+
+        exam_ids, course_names, duration, priority, counts, enrolled = [], [], [], [], [], []
+        with open(exams_path, mode='r', newline='') as file:
+            for row in csv.DictReader(file):
+                ids = np.array([int(sid) for sid in row['student_ids'].split(';')], dtype=np.int32)
+                exam_ids.append(int(row['id']))
+                course_names.append(row['course_name'])
+                duration.append(int(row['duration']))
+                priority.append(int(row['priority']))
+                counts.append(len(ids))
+                enrolled.append(ids)
+
+        room_ids, room_names, capacity = [], [], []
+        with open(rooms_path, mode='r', newline='') as file:
+            for row in csv.DictReader(file):
+                room_ids.append(int(row['id']))
+                room_names.append(row['room_name'])
+                capacity.append(int(row['capacity']))
+
+        student_ids = np.array(student_ids, dtype=np.int32)
+        enrolled = np.concatenate(enrolled) if enrolled else np.zeros(0, dtype=np.int32)
+        return cls(
+            student_ids, student_names,
+            np.array(exam_ids, dtype=np.int32), course_names,
+            np.array(duration, dtype=np.int32), np.array(priority, dtype=np.int32),
+            _pointers(counts), _positions(student_ids, enrolled),
+            np.array(room_ids, dtype=np.int32), room_names, np.array(capacity, dtype=np.int32),
+        )
+
+    @classmethod
+    def from_objects(cls, students, exams, rooms):
+        """Columnar view of existing Student/Exam/Room lists (kept as-is).
+
+        Students enrolled in an exam but missing from ``students`` are
+        appended, and ``students`` may be None to take them from the exams.
+        """
+        students = list(students) if students is not None else []
+        known = {student.student_id for student in students}
+        for exam in exams:
+            for student in exam.students:
+                if student.student_id not in known:
+                    known.add(student.student_id)
+                    students.append(student)
+
+        student_ids = np.array([s.student_id for s in students], dtype=np.int32)
+        enrolled = np.array([s.student_id for exam in exams for s in exam.students], dtype=np.int32)
+        instance = cls(
+            student_ids, [s.name for s in students],
+            np.array([exam.exam_id for exam in exams], dtype=np.int32),
+            [exam.course_name for exam in exams],
+            np.array([exam.duration for exam in exams], dtype=np.int32),
+            np.array([exam.priority for exam in exams], dtype=np.int32),
+            _pointers([len(exam.students) for exam in exams]), _positions(student_ids, enrolled),
+            np.array([room.room_id for room in rooms], dtype=np.int32),
+            [room.room_name for room in rooms],
+            np.array([room.capacity for room in rooms], dtype=np.int32),
+        )
+        instance._students, instance._exams, instance._rooms = students, list(exams), list(rooms)
+        return instance
+
+    @classmethod
+    def cached(cls, students_path='students.csv', exams_path='exams.csv', rooms_path='rooms.csv',
+               cache_dir=None):
+        """Load the instance through a binary cache keyed by a hash of the CSVs.
+
+        The first load parses the CSVs and writes an uncompressed ``.npz``
+        into ``cache_dir`` (default: ``.instance_cache`` next to the exams
+        file); later loads read the arrays back directly.  Editing any CSV
+        changes the hash, so a stale cache is never used, and superseded
+        cache files are removed.  Within one process every caller gets the
+        same Instance object.
+        """
+        key = source_hash(students_path, exams_path, rooms_path)
+        if key in _loaded:
+            return _loaded[key]
+
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.dirname(os.path.abspath(exams_path)), CACHE_DIR)
+        cache_path = os.path.join(cache_dir, f"instance-{key[:24]}.npz")
+        if os.path.exists(cache_path):
+            try:
+                instance = cls.load(cache_path)
+            except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+                # Unreadable or truncated cache file: rebuild it
+                instance = None
+        else:
+            instance = None
+
+        if instance is None:
+            instance = cls.from_csv(students_path, exams_path, rooms_path)
+            try:
+                instance.save(cache_path)
+                for old in glob.glob(os.path.join(cache_dir, 'instance-*.npz')):
+                    if old != cache_path:
+                        os.remove(old)
+            except OSError:
+                pass  # Read-only location: run without a cache
+
+        _loaded[key] = instance
+        return instance
+
+    def save(self, path):
+        """Write the arrays to an uncompressed ``.npz`` file (atomically)"""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        arrays = {name: getattr(self, name) for name in _FIELDS}
+        for name in _TEXT_FIELDS:
+            arrays[name] = np.array(arrays[name], dtype=str)
+        handle, temp_path = tempfile.mkstemp(dir=directory, suffix='.npz')
+        try:
+            with os.fdopen(handle, 'wb') as file:
+                np.savez(file, **arrays)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        """Read an instance written by ``save``"""
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {name: data[name] for name in _FIELDS}
+        for name in _TEXT_FIELDS:
+            arrays[name] = arrays[name].tolist()
+        return cls(**arrays)
+
+    # ---- Sizes and derived columns ----
+
+    @property
+    def num_students(self):
+        return len(self.student_ids)
+
+    @property
+    def num_exams(self):
+        return len(self.exam_ids)
+
+    @property
+    def num_rooms(self):
+        return len(self.room_ids)
+
+    @property
+    def enrollment(self):
+        """Number of students per exam"""
+        return np.diff(self.student_ptr)
+
+    def exam_students(self, exam):
+        """Student ids (int32 array) of the exam at position ``exam``"""
+        return self.student_ids[self.student_idx[self.student_ptr[exam]:self.student_ptr[exam + 1]]]
+
+    def rooms_by_capacity(self):
+        """Room positions from largest to smallest capacity (ties keep file order)"""
+        return np.argsort(-self.capacity, kind='stable').tolist()
+
+    # ---- Lazily materialized objects ----
+
+    @property
+    def students(self):
+        if self._students is None:
+            self._students = [Student(int(sid), name) for sid, name in zip(self.student_ids, self.student_names)]
+        return self._students
+
+    @property
+    def exams(self):
+        if self._exams is None:
+            students = self.students
+            ptr = self.student_ptr
+            self._exams = [
+                Exam(int(self.exam_ids[e]), self.course_names[e], int(self.duration[e]),
+                     [students[s] for s in self.student_idx[ptr[e]:ptr[e + 1]].tolist()],
+                     int(self.priority[e]))
+                for e in range(self.num_exams)
+            ]
+        return self._exams
+
+    @property
+    def rooms(self):
+        if self._rooms is None:
+            self._rooms = [
+                Room(int(rid), name, int(cap))
+                for rid, name, cap in zip(self.room_ids, self.room_names, self.capacity)
+            ]
+        return self._rooms
+
+    def __getstate__(self):
+        # Ship only the arrays (e.g. to worker processes); objects are rebuilt on demand
+        state = self.__dict__.copy()
+        state['_students'] = state['_exams'] = state['_rooms'] = None
+        return state
+
+
+def _pointers(counts):
+    ptr = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=ptr[1:])
+    return ptr
+
+
+def _positions(student_ids, enrolled):
+    """Positions in ``student_ids`` of every enrolled student id"""
+    order = np.argsort(student_ids, kind='stable')
+    found = np.searchsorted(student_ids[order], enrolled)
+    found = np.minimum(found, max(len(order) - 1, 0))
+    if len(enrolled) and (not len(order) or (student_ids[order][found] != enrolled).any()):
+        missing = enrolled[student_ids[order][found] != enrolled] if len(order) else enrolled
+        raise KeyError(int(missing[0]))
+    return order[found].astype(np.int32)
+
+
+def source_hash(*paths):
+    """SHA-256 of the cache format version and the contents of ``paths``"""
+    digest = hashlib.sha256(f"instance-cache-v{CACHE_VERSION}".encode())
+    for path in paths:
+        digest.update(b'\0')
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,135 @@
+"""Lightweight named timers and counters for per-phase profiling.
+
+Instrumentation is off by default. While disabled, ``timer()`` returns a
+shared no-op context manager and ``count()`` returns immediately, so the
+hooks left in the solvers cost close to nothing. Call ``enable()`` (as
+``main.py --profile`` does) to start recording, then ``report()`` for a
+per-phase breakdown.
+
+    with timer('ga.fitness'):
+        scores = [...]
+    count('ga.evaluations', len(scores))
+"""
+import functools
+import time
+from collections import defaultdict
+
+_enabled = False
+_totals = defaultdict(float)   # timer name -> seconds
+_calls = defaultdict(int)      # timer name -> number of timed blocks
+_counters = defaultdict(int)   # counter name -> value
+_started = None
+
+
+class _Timer:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _totals[self.name] += time.perf_counter() - self.start
+        _calls[self.name] += 1
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def enable():
+    """Start recording (clears previous measurements)"""
+    global _enabled, _started
+    reset()
+    _enabled = True
+    _started = time.perf_counter()
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    global _started
+    _totals.clear()
+    _calls.clear()
+    _counters.clear()
+    _started = time.perf_counter() if _enabled else None
+
+
+def timer(name):
+    """Context manager adding the elapsed time of its block to ``name``"""
+    if not _enabled:
+        return _NULL_TIMER
+    return _Timer(name)
+
+
+def count(name, amount=1):
+    """Add ``amount`` to counter ``name``"""
+    if _enabled:
+        _counters[name] += amount
+
+
+def timed(name):
+    """Decorator timing every call of a function under ``name``"""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            with _Timer(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def snapshot():
+    """Copy of the measurements: ``{'timers': {name: (seconds, calls)}, 'counters': {...}}``"""
+    return {
+        'timers': {name: (_totals[name], _calls[name]) for name in _totals},
+        'counters': dict(_counters),
+    }
+
+
+def report():
+    """Per-phase breakdown table as a string.
+
+    Timers may be nested (e.g. a generation contains its fitness phase), so
+    the percentages of wall time do not necessarily add up to 100.
+    """
+    wall = time.perf_counter() - _started if _started is not None else 0.0
+    lines = [
+        f"{'Phase':<28}{'Calls':>10}{'Total (s)':>12}{'Mean (ms)':>12}{'% wall':>9}",
+        "-" * 71,
+    ]
+    for name, total in sorted(_totals.items(), key=lambda item: item[1], reverse=True):
+        calls = _calls[name]
+        share = 100.0 * total / wall if wall > 0 else 0.0
+        lines.append(f"{name:<28}{calls:>10}{total:>12.3f}{1000.0 * total / calls:>12.3f}{share:>8.1f}%")
+    if _counters:
+        lines.append("")
+        lines.append(f"{'Counter':<28}{'Value':>10}")
+        lines.append("-" * 38)
+        for name in sorted(_counters):
+            lines.append(f"{name:<28}{_counters[name]:>10}")
+    lines.append("")
+    lines.append(f"Wall time: {wall:.3f} s")
+    return "\n".join(lines)
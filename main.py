@@ -1,26 +1,132 @@
+import argparse
+import cProfile
+import os
 import time
+from datetime import datetime
 import matplotlib.pyplot as plt
 import numpy as np
 from timetable import Timetable
 from visualize import generate_pdf_timetable, visualize_comparison
 from visualize_all_table import generate_entire_timetable
-from aco import ACO
-from genetic import GeneticAlgorithm
+from aco import ACO, MERGES
+from annealing import SimulatedAnnealing
+from encoder import write_encoded
+from genetic import CROSSOVERS, REPLACEMENTS, SEEDINGS, TOPOLOGIES, GeneticAlgorithm
+from Time_Slots import Calendar
+import Time_Slots
+import instrumentation
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exam timetabling with GA, ACO and simulated annealing")
+    parser.add_argument('--profile', action='store_true',
+                        help="print a per-phase timing breakdown at the end of the run")
+    parser.add_argument('--profile-output', metavar='FILE',
+                        help="with --profile, also write cProfile statistics (pstats format) to FILE")
+    parser.add_argument('--start-date', type=datetime.fromisoformat, default=Time_Slots.start_date,
+                        help="first day of the exam period (YYYY-MM-DD)")
+    parser.add_argument('--end-date', type=datetime.fromisoformat, default=Time_Slots.end_date,
+                        help="last day of the exam period (YYYY-MM-DD)")
+    parser.add_argument('--daily-slots', type=int, default=Time_Slots.daily_slots,
+                        help="number of exam timeslots per day")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes for GA scoring/islands and ACO ant cohorts")
+    parser.add_argument('--seeding', choices=SEEDINGS, default='random',
+                        help="GA initial population: random or graph-colouring (DSatur) seeds")
+    parser.add_argument('--crossover', choices=CROSSOVERS, default='two_point',
+                        help="GA crossover operator")
+    parser.add_argument('--crossover-repair', type=int, default=0, metavar='N',
+                        help="greedily re-place up to N clashing exams of every GA child")
+    parser.add_argument('--memetic', type=int, default=0, metavar='K',
+                        help="memetic GA: local search on the K fittest individuals of every generation")
+    parser.add_argument('--memetic-budget', type=float, default=0.1, metavar='SECONDS',
+                        help="CPU seconds of memetic local search per generation")
+    parser.add_argument('--replacement', choices=REPLACEMENTS, default='generational',
+                        help="how GA children replace the population")
+    parser.add_argument('--replacement-size', type=int, default=2, metavar='N',
+                        help="elites kept (elitism) or children bred per generation (steady_state)")
+    parser.add_argument('--islands', type=int, default=0,
+                        help="run the GA as this many islands with periodic migration")
+    parser.add_argument('--migration-interval', type=int, default=10,
+                        help="generations between island migrations")
+    parser.add_argument('--topology', choices=TOPOLOGIES, default='ring',
+                        help="island migration topology")
+    parser.add_argument('--colonies', type=int, default=0,
+                        help="run ACO as this many colonies with periodic pheromone merging")
+    parser.add_argument('--merge-interval', type=int, default=10,
+                        help="iterations between colony pheromone merges")
+    parser.add_argument('--merge', choices=MERGES, default='average',
+                        help="how colony pheromone matrices are merged")
+    parser.add_argument('--time-limit', type=float, default=None, metavar='SECONDS',
+                        help="wall-clock budget per algorithm; the best timetable so far is kept")
+    parser.add_argument('--stagnation', type=int, default=None, metavar='N',
+                        help="stop an algorithm after N generations/iterations without improvement")
+    parser.add_argument('--checkpoint-dir', metavar='DIR',
+                        help="periodically save GA/ACO run state to DIR (not with --islands/--colonies)")
+    parser.add_argument('--checkpoint-interval', type=int, default=10,
+                        help="generations/iterations between checkpoints")
+    parser.add_argument('--resume', action='store_true',
+                        help="continue the runs saved in --checkpoint-dir")
+    args = parser.parse_args()
+    if args.resume and not args.checkpoint_dir:
+        parser.error("--resume requires --checkpoint-dir")
+    ga_checkpoint = os.path.join(args.checkpoint_dir, 'ga_checkpoint.npz') if args.checkpoint_dir else None
+    aco_checkpoint = os.path.join(args.checkpoint_dir, 'aco_checkpoint.npz') if args.checkpoint_dir else None
+    
+    # Exam period shared by both algorithms
+    calendar = Calendar(args.start_date, args.end_date, args.daily_slots)
+    
+    profiler = None
+    if args.profile:
+        instrumentation.enable()
+        if args.profile_output:
+            profiler = cProfile.Profile()
+            profiler.enable()
+    
     results = {}
      # Run Genetic Algorithm
     print("\n[RUNNING] Genetic Algorithm...")
     ga_start_time = time.time()
     
-    ga = GeneticAlgorithm()
-    population = ga.generate_population(population_size=20)
-    ga_solution, ga_generation, ga_decoded = ga.genetic_algorithm(
-        population, 
-        max_generation=100,
-        optimalFitness=-50,  # Target fitness threshold
-        mutation_rate=0.15
-    )
+    ga = GeneticAlgorithm(time_slots=calendar)
+    ga.seeding = args.seeding
+    ga.crossover = args.crossover
+    ga.crossover_repair = args.crossover_repair
+    if args.islands:
+        ga_solution, ga_generation, ga_decoded = ga.island_model(
+            population_size=20,
+            islands=args.islands,
+            max_generation=100,
+            optimalFitness=-50,  # Target fitness threshold
+            migration_interval=args.migration_interval,
+            topology=args.topology,
+            mutation_rate=0.15,
+            workers=args.workers,
+            time_limit=args.time_limit,
+            stagnation_limit=args.stagnation
+        )
+    elif args.resume and os.path.exists(ga_checkpoint):
+        ga_solution, ga_generation, ga_decoded = ga.resume(
+            ga_checkpoint,
+            time_limit=args.time_limit,
+            stagnation_limit=args.stagnation
+        )
+    else:
+        population = ga.generate_population(population_size=20)
+        ga_solution, ga_generation, ga_decoded = ga.genetic_algorithm(
+            population, 
+            max_generation=100,
+            optimalFitness=-50,  # Target fitness threshold
+            mutation_rate=0.15,
+            workers=args.workers,
+            time_limit=args.time_limit,
+            stagnation_limit=args.stagnation,
+            checkpoint_path=ga_checkpoint,
+            checkpoint_interval=args.checkpoint_interval,
+            memetic=args.memetic,
+            memetic_budget=args.memetic_budget,
+            replacement=args.replacement,
+            replacement_size=args.replacement_size
+        )
     
     ga_end_time = time.time()
     ga_execution_time = ga_end_time - ga_start_time
@@ -36,6 +142,9 @@ if __name__ == "__main__":
     print(f"  - Best fitness: {ga_fitness}")
     print(f"  - Solution found at generation: {ga_generation}")
     
+    # Keep the encoded solution for later repairs (see repair.py)
+    write_encoded("GA_Solution.txt", ga_solution)
+    
     # Create GA timetable
     ga_timetable = Timetable(ga_decoded)
     generate_entire_timetable(
@@ -71,12 +180,36 @@ if __name__ == "__main__":
     print("\n[RUNNING] Ant Colony Optimization Algorithm...")
     aco_start_time = time.time()
     
-    aco = ACO()
-    aco_solution, aco_iteration, aco_decoded = aco.run_aco(
-        num_iterations=100,
-        num_ants=20,
-        local_search_iterations=5
-    )
+    aco = ACO(time_slots=calendar)
+    if args.colonies:
+        aco_solution, aco_iteration, aco_decoded = aco.run_colonies(
+            colonies=args.colonies,
+            num_iterations=100,
+            num_ants=20,
+            local_search_iterations=5,
+            merge_interval=args.merge_interval,
+            merge=args.merge,
+            workers=args.workers,
+            time_limit=args.time_limit,
+            stagnation_limit=args.stagnation
+        )
+    elif args.resume and os.path.exists(aco_checkpoint):
+        aco_solution, aco_iteration, aco_decoded = aco.resume(
+            aco_checkpoint,
+            time_limit=args.time_limit,
+            stagnation_limit=args.stagnation
+        )
+    else:
+        aco_solution, aco_iteration, aco_decoded = aco.run_aco(
+            num_iterations=100,
+            num_ants=20,
+            local_search_iterations=5,
+            workers=args.workers,
+            time_limit=args.time_limit,
+            stagnation_limit=args.stagnation,
+            checkpoint_path=aco_checkpoint,
+            checkpoint_interval=args.checkpoint_interval
+        )
     
     aco_end_time = time.time()
     aco_execution_time = aco_end_time - aco_start_time
@@ -92,6 +225,9 @@ if __name__ == "__main__":
     print(f"  - Best fitness: {aco_fitness}")
     print(f"  - Solution found at iteration: {aco_iteration}")
     
+    # Keep the encoded solution for later repairs (see repair.py)
+    write_encoded("ACO_Solution.txt", aco_solution)
+    
     # Create ACO timetable
     aco_timetable = Timetable(aco_decoded)
     generate_entire_timetable(
@@ -123,6 +259,65 @@ if __name__ == "__main__":
         'solution': aco_decoded
     }
     
+    # Run Simulated Annealing
+    print("\n[RUNNING] Simulated Annealing...")
+    sa_start_time = time.time()
+    
+    sa = SimulatedAnnealing(time_slots=calendar)
+    sa_solution, sa_iteration, sa_decoded = sa.run_annealing(
+        max_iterations=100,
+        time_limit=args.time_limit,
+        stagnation_limit=args.stagnation
+    )
+    
+    sa_end_time = time.time()
+    sa_execution_time = sa_end_time - sa_start_time
+    
+    # Calculate SA fitness
+    sa_fitness = sa.get_fitness(sa_decoded, sa.exams)
+    
+    # Get conflict stats
+    sa_conflicts = sa.conflict_stats
+    
+    print(f"\n[COMPLETED] Simulated Annealing")
+    print(f"  - Execution time: {sa_execution_time:.2f} seconds")
+    print(f"  - Best fitness: {sa_fitness}")
+    print(f"  - Solution found at iteration: {sa_iteration}")
+    
+    # Keep the encoded solution for later repairs (see repair.py)
+    write_encoded("SA_Solution.txt", sa_solution)
+    
+    # Create SA timetable
+    sa_timetable = Timetable(sa_decoded)
+    generate_entire_timetable(
+        timetable=sa_timetable,
+        exams=sa.exams,
+        rooms=sa.rooms,
+        filename="SA_Entire_Table.pdf"
+    )
+    generate_pdf_timetable(
+        timetable=sa_timetable,
+        exams=sa.exams,
+        rooms=sa.rooms,
+        filename="SA_Daily_Schedule.pdf",
+        conflict_data={
+            'student_conflicts': sa.student_conflicts,
+            'room_conflicts': sa.room_conflicts,
+            'capacity_issues': sa.capacity_issues,
+            'consecutive_exams': sa.consecutive_exams,
+            'non_consecutive_slots': sa.non_consecutive_slots,
+            'conflict_stats': sa.conflict_stats
+        }
+    )
+    
+    # Store SA results
+    results['sa'] = {
+        'execution_time': sa_execution_time,
+        'fitness': sa_fitness,
+        'conflicts': sa_conflicts,
+        'solution': sa_decoded
+    }
+    
     print("\n" + "-" * 50)
     
     # Print comparison summary
@@ -130,22 +325,33 @@ if __name__ == "__main__":
     print("ALGORITHM COMPARISON SUMMARY")
     print("=" * 50)
     
+    names = {'aco': 'ACO', 'ga': 'GA', 'sa': 'SA'}
+    
     print(f"\nExecution Time:")
-    print(f"  - ACO: {aco_execution_time:.2f} seconds")
-    print(f"  - GA:  {ga_execution_time:.2f} seconds")
-    print(f"  - Time Difference: {abs(aco_execution_time - ga_execution_time):.2f} seconds")
-    print(f"  - Faster Algorithm: {'ACO' if aco_execution_time < ga_execution_time else 'GA'}")
+    for key, result in results.items():
+        print(f"  - {names[key] + ':':<4} {result['execution_time']:.2f} seconds")
+    print(f"  - Fastest Algorithm: {names[min(results, key=lambda k: results[k]['execution_time'])]}")
     
     print(f"\nSolution Quality:")
-    print(f"  - ACO Fitness: {aco_fitness}")
-    print(f"  - GA Fitness:  {ga_fitness}")
-    print(f"  - Better Solution: {'ACO' if aco_fitness > ga_fitness else 'GA'}")
+    for key, result in results.items():
+        print(f"  - {names[key] + ' Fitness:':<12} {result['fitness']}")
+    print(f"  - Best Solution: {names[max(results, key=lambda k: results[k]['fitness'])]}")
     
     print(f"\nConflict Comparison:")
-    print(f"  - Student Conflicts: ACO: {aco_conflicts['student_conflicts']}, GA: {ga_conflicts['student_conflicts']}")
-    print(f"  - Room Conflicts: ACO: {aco_conflicts['room_conflicts']}, GA: {ga_conflicts['room_conflicts']}")
-    print(f"  - Capacity Issues: ACO: {aco_conflicts['capacity_issues']}, GA: {ga_conflicts['capacity_issues']}")
-    print(f"  - Multiple Exams Per Day: ACO: {aco_conflicts['consecutive_exams']}, GA: {ga_conflicts['consecutive_exams']}")
-    print(f"  - Non-consecutive Timeslots: ACO: {aco_conflicts['non_consecutive_slots']}, GA: {ga_conflicts['non_consecutive_slots']}")
+    for label, stat in [('Student Conflicts', 'student_conflicts'), ('Room Conflicts', 'room_conflicts'),
+                        ('Capacity Issues', 'capacity_issues'), ('Multiple Exams Per Day', 'consecutive_exams'),
+                        ('Non-consecutive Timeslots', 'non_consecutive_slots')]:
+        print(f"  - {label}: " + ", ".join(f"{names[key]}: {result['conflicts'][stat]}" for key, result in results.items()))
     visualize_comparison(results)
+    
+    if args.profile:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile_output)
+        print("\n" + "=" * 50)
+        print("PROFILE")
+        print("=" * 50)
+        print(instrumentation.report())
+        if profiler is not None:
+            print(f"\ncProfile statistics written to {args.profile_output}")
     
\ No newline at end of file
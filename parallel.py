@@ -0,0 +1,138 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Solver rebuilt once in each worker process by the pool initializer
+_solver = None
+
+# Shared-memory blocks attached by this worker process, by name
+_attached = {}
+
+
+def create_pool(solver, workers, settings=None):
+    """Start a process pool whose workers each hold a copy of ``solver``'s data.
+
+    The columnar problem instance and the calendar are sent once per
+    worker at startup; ``settings`` are extra solver attributes (e.g. ACO parameters)
+    copied onto the worker's solver.  Returns None when ``workers`` is falsy.
+    """
+    if not workers:
+        return None
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(type(solver), solver.instance, solver.calendar, settings or {}),
+    )
+
+
+def score_population(pool, population, workers):
+    """Fitness of every individual, scored in ``workers`` batches"""
+    scores = []
+    for batch in pool.map(_score_batch, _split(population, workers)):
+        scores.extend(batch)
+    return scores
+
+
+def run_ant_cohort(pool, pheromone, seeds, local_search_iterations, workers):
+    """Build, improve and score one solution per seed on the pool.
+
+    Each ant reseeds its worker's RNG from its own seed, so the cohort is
+    reproducible regardless of the number of workers.  Returns a list of
+    ``(solution, fitness)`` in seed order.
+    """
+    results = []
+    batches = _split(seeds, workers)
+    for batch in pool.map(_run_ants, [pheromone] * len(batches), batches,
+                          [local_search_iterations] * len(batches)):
+        results.extend(batch)
+    return results
+
+
+def run_island_epochs(pool, tasks, generations, settings, workers):
+    """Run one GA island epoch per ``(population, fitness_scores, seed)`` task.
+
+    ``settings`` are the remaining ``run_island_epoch`` arguments.  Returns
+    the epoch results in task order.
+    """
+    results = []
+    batches = _split(tasks, workers)
+    for batch in pool.map(_run_island_epochs, batches, [generations] * len(batches),
+                          [settings] * len(batches)):
+        results.extend(batch)
+    return results
+
+
+def create_shared_array(shape, dtype):
+    """Array backed by a new shared-memory block; returns ``(block, array)``.
+
+    The caller must ``close()`` and ``unlink()`` the block when done.
+    """
+    size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+    block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def run_colony_epochs(pool, shared_name, shape, tasks, iterations, num_ants, local_search_iterations, workers):
+    """Run one ACO colony epoch per ``(colony, seed)`` task.
+
+    Colony ``c`` works in place on ``pheromones[c]`` of the float32 shared
+    array ``shared_name`` of ``shape``.  Returns ``(best_solution,
+    best_fitness)`` per task, in task order.
+    """
+    results = []
+    batches = _split(tasks, workers)
+    for batch in pool.map(_run_colony_epochs, [shared_name] * len(batches), [shape] * len(batches), batches,
+                          [(iterations, num_ants, local_search_iterations)] * len(batches)):
+        results.extend(batch)
+    return results
+
+
+def _init_worker(solver_class, instance, calendar, settings):
+    global _solver
+    _solver = solver_class(instance=instance, time_slots=calendar)
+    for name, value in settings.items():
+        setattr(_solver, name, value)
+
+
+def _score_batch(individuals):
+    return [_solver.evaluate_individual(individual) for individual in individuals]
+
+
+def _run_ants(pheromone, seeds, local_search_iterations):
+    _solver.pheromone = pheromone
+    results = []
+    for seed in seeds:
+        random.seed(seed)
+        results.append(_solver.run_ant(local_search_iterations))
+    return results
+
+
+def _run_island_epochs(tasks, generations, settings):
+    return [_solver.run_island_epoch(population, fitness_scores, seed, generations, *settings)
+            for population, fitness_scores, seed in tasks]
+
+
+def _run_colony_epochs(shared_name, shape, tasks, settings):
+    pheromones = _attach(shared_name, shape, np.float32)
+    return [_solver.run_colony_epoch(pheromones[colony], seed, *settings) for colony, seed in tasks]
+
+
+def _attach(name, shape, dtype):
+    """View of a shared-memory block, attached once per worker process"""
+    if name not in _attached:
+        _attached[name] = shared_memory.SharedMemory(name=name)
+    return np.ndarray(shape, dtype=dtype, buffer=_attached[name].buf)
+
+
+def _split(items, parts):
+    """Split ``items`` into at most ``parts`` contiguous, non-empty batches"""
+    size, extra = divmod(len(items), parts)
+    batches, start = [], 0
+    for i in range(parts):
+        end = start + size + (1 if i < extra else 0)
+        if end > start:
+            batches.append(items[start:end])
+        start = end
+    return batches
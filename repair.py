@@ -0,0 +1,283 @@
+"""Incremental rescheduling after the input data changed.
+
+Instead of solving again from scratch, an existing timetable (a
+``Timetable``, its ``schedule`` dict or an encoded solution) is carried
+over to the new CSVs by exam, room and timeslot id.  Only the exams the
+change affects, plus the exams clashing with them, are re-optimized;
+every other exam keeps its timeslots and rooms.
+
+    python repair.py --old old_data/ --new . --solution GA_Solution.txt --output Repaired_Solution.txt
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from anytime import Budget
+from data import Data
+from encoder import parse_assignment, read_encoded, write_encoded
+from fitness import IncrementalEvaluator
+from genome import Genome
+from seeding import Seeder
+from solver import Problem
+from timetable import Timetable
+
+
+class InstanceDiff:
+    """What changed between two instances, by exam and room id.
+
+    ``changed_exams`` are exams whose enrollment, duration or priority
+    differ; ``shrunk_rooms`` are rooms whose capacity went down.
+    """
+
+    def __init__(self, old, new):
+        old_exams = {int(exam_id): i for i, exam_id in enumerate(old.exam_ids)}
+        new_exams = {int(exam_id): i for i, exam_id in enumerate(new.exam_ids)}
+        self.removed_exams = sorted(old_exams.keys() - new_exams.keys())
+        self.added_exams = sorted(new_exams.keys() - old_exams.keys())
+        self.changed_exams = []
+        for exam_id in sorted(old_exams.keys() & new_exams.keys()):
+            i, j = old_exams[exam_id], new_exams[exam_id]
+            if (old.duration[i] != new.duration[j] or old.priority[i] != new.priority[j]
+                    or not np.array_equal(np.sort(old.exam_students(i)), np.sort(new.exam_students(j)))):
+                self.changed_exams.append(exam_id)
+
+        old_rooms = {int(room_id): int(cap) for room_id, cap in zip(old.room_ids, old.capacity)}
+        new_rooms = {int(room_id): int(cap) for room_id, cap in zip(new.room_ids, new.capacity)}
+        self.removed_rooms = sorted(old_rooms.keys() - new_rooms.keys())
+        self.added_rooms = sorted(new_rooms.keys() - old_rooms.keys())
+        self.shrunk_rooms = sorted(room_id for room_id in old_rooms.keys() & new_rooms.keys()
+                                   if new_rooms[room_id] < old_rooms[room_id])
+
+    def __bool__(self):
+        return bool(self.removed_exams or self.added_exams or self.changed_exams
+                    or self.removed_rooms or self.added_rooms or self.shrunk_rooms)
+
+    def summary(self):
+        parts = [
+            (self.added_exams, "added exams"), (self.removed_exams, "removed exams"),
+            (self.changed_exams, "changed exams"), (self.added_rooms, "added rooms"),
+            (self.removed_rooms, "removed rooms"), (self.shrunk_rooms, "smaller rooms"),
+        ]
+        text = ", ".join(f"{len(ids)} {label} {ids}" for ids, label in parts if ids)
+        return text or "no changes"
+
+
+class Rescheduler(Problem):
+    """Repairs a timetable on a (changed) instance with local moves.
+
+    Exams are moved one at a time to the best consecutive timeslot window
+    of their day and room set, scored with the incremental evaluator.
+    ``room_options`` caps the number of room sets tried per exam.
+    """
+
+    def __init__(self, students=None, exams=None, rooms=None, time_slots=None, instance=None, room_options=6):
+        # Same data sources as the solvers
+        super().__init__(students, exams, rooms, time_slots, instance)
+        self.room_options = room_options
+
+        # Same-day timeslot windows per exam length, as in DSatur seeding
+        self.seeder = Seeder(self.fitness_engine)
+
+    def placements(self, timetable, old_instance=None):
+        """``{exam_id: (room_ids, timeslot_ids)}`` of a Timetable, its
+        ``schedule`` dict or an encoded solution.  Encoded positions refer
+        to ``old_instance`` (default: this instance) and this calendar."""
+        if isinstance(timetable, Timetable):
+            timetable = timetable.schedule
+        if isinstance(timetable, dict):
+            return {
+                exam_id: ([room.room_id for room in rooms], [ts.timeslot_id for ts in timeslots])
+                for exam_id, (rooms, timeslots) in timetable.items()
+            }
+
+        source = old_instance if old_instance is not None else self.instance
+        placements = {}
+        for item in timetable:
+            parsed = parse_assignment(item, source.num_exams, len(self.time_slots), source.num_rooms)
+            if parsed is None:
+                continue
+            exam, slots, rooms = parsed
+            placements[int(source.exam_ids[exam])] = (
+                [int(source.room_ids[r]) for r in rooms],
+                [self.time_slots[t].timeslot_id for t in slots],
+            )
+        return placements
+
+    def seed(self, placements):
+        """Genome on this instance with every exam, room and timeslot of
+        ``placements`` that still exists; returns ``(genome, damaged)``
+        where ``damaged`` are the exams that lost a timeslot or room."""
+        engine = self.fitness_engine
+        genome = Genome.empty(self.instance.num_exams, self.instance.num_rooms)
+        damaged = set()
+        for exam_id, (room_ids, slot_ids) in placements.items():
+            exam = engine.exam_index.get(exam_id)
+            if exam is None:
+                continue
+            slots = sorted(engine.slot_index[t] for t in slot_ids if t in engine.slot_index)
+            rooms = [engine.room_index[r] for r in room_ids if r in engine.room_index]
+            if len(slots) < len(slot_ids) or len(rooms) < len(room_ids):
+                damaged.add(exam)
+            if slots and rooms:
+                genome.set_slots(exam, slots[0], len(slots))
+                genome.set_rooms(exam, rooms)
+        return genome, damaged
+
+    def affected_exams(self, genome, placements, diff=None, damaged=()):
+        """Exam indices that must be rescheduled: unscheduled, damaged,
+        changed in ``diff`` or placed in a room that got smaller."""
+        engine = self.fitness_engine
+        affected = set(damaged)
+        affected.update(np.flatnonzero(genome.length == 0).tolist())
+        affected.update(np.flatnonzero(~genome.room_matrix().any(axis=1)).tolist())
+        if diff is not None:
+            affected.update(engine.exam_index[exam_id] for exam_id in diff.changed_exams + diff.added_exams
+                            if exam_id in engine.exam_index)
+            shrunk = set(diff.shrunk_rooms) | set(diff.removed_rooms)
+            for exam_id, (room_ids, _) in placements.items():
+                if exam_id in engine.exam_index and shrunk.intersection(room_ids):
+                    affected.add(engine.exam_index[exam_id])
+        return sorted(affected)
+
+    def neighbourhood(self, genome, exams):
+        """Scheduled exams outside ``exams`` that share a timeslot with one
+        of them and have students or rooms in common with it"""
+        overlap = self.fitness_engine.conflict_graph.overlap
+        start = genome.start.astype(np.int64)
+        end = start + genome.length
+        scheduled = (genome.length > 0) & genome.room_matrix().any(axis=1)
+        chosen = np.zeros(len(genome), dtype=bool)
+        chosen[list(exams)] = True
+
+        neighbours = set()
+        for exam in exams:
+            if not scheduled[exam]:
+                continue
+            same_time = scheduled & ~chosen & (start < end[exam]) & (start[exam] < end)
+            shared_rooms = (genome.rooms & genome.rooms[exam]).any(axis=1)
+            neighbours.update(np.flatnonzero(same_time & ((overlap[exam] > 0) | shared_rooms)).tolist())
+        return sorted(neighbours)
+
+    def candidate_rooms(self, exam):
+        """Room sets with enough seats and the least spare capacity"""
+        return self.fitness_engine.room_packer.options(self.instance.enrollment[exam], self.room_options)
+
+    def best_move(self, evaluator, exam):
+        """``(delta, slots, rooms)`` of the best placement of one exam.
+
+        Every pair of a same-day timeslot window of the exam's length
+        (``Seeder.windows``) and a candidate room set is scored in one
+        ``placement_deltas`` call, with the exam briefly taken out.
+        """
+        windows = self.seeder.windows[int(self.seeder.required[exam])]
+        room_sets = self.candidate_rooms(exam)
+        candidates = [(w, r) for r in range(len(room_sets)) for w in range(len(windows))]
+
+        old_slots, old_rooms = evaluator.slots[exam], evaluator.rooms[exam]
+        removed = evaluator.move(exam, (), ())
+        deltas = removed + evaluator.placement_deltas(
+            exam, windows, self.fitness_engine.room_packer.room_masks(room_sets), candidates)
+        evaluator.move(exam, old_slots, old_rooms)
+
+        best = int(np.argmin(deltas))
+        w, r = candidates[best]
+        return float(deltas[best]), windows[w].tolist(), room_sets[r]
+
+    def repair(self, timetable, old_instance=None, passes=5, time_limit=None):
+        """Carry ``timetable`` over to this instance and re-optimize only
+        what the change touched.
+
+        Affected exams (see ``affected_exams``; with ``old_instance`` the
+        data diff is taken into account) that lost their placement are
+        placed first, most constrained first; then up to ``passes`` rounds
+        move affected and neighbouring exams while that lowers the penalty,
+        within ``time_limit`` seconds.  Returns ``(encoded, moved_exam_ids,
+        decoded)``.
+        """
+        started = time.perf_counter()
+        diff = InstanceDiff(old_instance, self.instance) if old_instance is not None else None
+        if diff is not None:
+            print(f"Data changes: {diff.summary()}")
+
+        placements = self.placements(timetable, old_instance)
+        genome, damaged = self.seed(placements)
+        affected = self.affected_exams(genome, placements, diff, damaged)
+        free = sorted(set(affected) | set(self.neighbourhood(genome, affected)))
+        print(f"Rescheduling {len(affected)} affected exams and {len(free) - len(affected)} neighbours "
+              f"of {self.instance.num_exams}")
+
+        evaluator = IncrementalEvaluator(self.fitness_engine).load_genome(genome)
+        graph = self.fitness_engine.conflict_graph
+
+        # Exams without a usable placement get the best one available
+        unplaced = [exam for exam in affected if genome.length[exam] == 0 or exam in damaged
+                    or not genome.room_list(exam)]
+        unplaced.sort(key=lambda exam: (-int(graph.degree[exam]), -int(self.instance.enrollment[exam])))
+        for exam in unplaced:
+            _, slots, rooms = self.best_move(evaluator, exam)
+            evaluator.move(exam, slots, rooms)
+            genome.set_slots(exam, slots[0], len(slots))
+            genome.set_rooms(exam, rooms)
+
+        # Improvement passes over the free exams only
+        budget = Budget(time_limit)
+        passes_run = 0
+        for _ in range(passes):
+            passes_run += 1
+            improved = False
+            for exam in free:
+                delta, slots, rooms = self.best_move(evaluator, exam)
+                if delta < 0:
+                    evaluator.move(exam, slots, rooms)
+                    genome.set_slots(exam, slots[0], len(slots))
+                    genome.set_rooms(exam, rooms)
+                    improved = True
+                if budget.exhausted():
+                    break
+            if not improved or budget.exhausted():
+                break
+
+        moved = self.moved_exams(genome, placements)
+        fitness = self.fitness_engine.score_genome(genome)
+        print(f"Repaired in {time.perf_counter() - started:.2f} s ({passes_run} passes): "
+              f"fitness {fitness}, {len(moved)} exams moved {moved}")
+        return genome.to_encoded(), moved, genome.decode(self.exams, self.rooms, self.time_slots)
+
+    def moved_exams(self, genome, placements):
+        """Ids of exams whose timeslots or rooms differ from ``placements``"""
+        moved = []
+        for exam, exam_id in enumerate(self.instance.exam_ids.tolist()):
+            rooms = sorted(int(self.instance.room_ids[r]) for r in genome.room_list(exam))
+            slots = [self.time_slots[t].timeslot_id for t in genome.slots(exam)]
+            old_rooms, old_slots = placements.get(exam_id, ([], []))
+            if rooms != sorted(old_rooms) or slots != sorted(old_slots):
+                moved.append(exam_id)
+        return moved
+
+
+def load_directory(directory):
+    """Instance from the students/exams/rooms CSVs in ``directory``"""
+    return Data.load_instance(
+        os.path.join(directory, 'students.csv'),
+        os.path.join(directory, 'exams.csv'),
+        os.path.join(directory, 'rooms.csv'),
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Repair a timetable after the input CSVs changed")
+    parser.add_argument('--old', required=True, metavar='DIR', help="directory with the CSVs the solution was made for")
+    parser.add_argument('--new', default='.', metavar='DIR', help="directory with the changed CSVs")
+    parser.add_argument('--solution', required=True, help="encoded solution (e.g. GA_Solution.txt)")
+    parser.add_argument('--output', default='Repaired_Solution.txt')
+    parser.add_argument('--passes', type=int, default=5)
+    parser.add_argument('--time-limit', type=float, default=None, metavar='SECONDS')
+    args = parser.parse_args()
+
+    rescheduler = Rescheduler(instance=load_directory(args.new))
+    encoded, moved, _ = rescheduler.repair(read_encoded(args.solution), load_directory(args.old),
+                                           passes=args.passes, time_limit=args.time_limit)
+    write_encoded(args.output, encoded)
+    print(f"Repaired solution written to {args.output}")
@@ -0,0 +1,126 @@
+from collections import OrderedDict
+
+import numpy as np
+
+
+class RoomPacker:
+    """Minimal-waste room sets for a required number of seats.
+
+    A 0/1 subset-sum DP over the room capacities is run once: for every
+    reachable total capacity it keeps the set with the fewest rooms (as a
+    packed room bitmask, like ``Genome.rooms``).  The reachable totals are
+    sorted, so the sets with the least waste for ``needed`` seats are found
+    with one table lookup.
+
+    ``occupied`` (a boolean mask over rooms, e.g. the rooms already booked
+    in a timeslot) restricts the answer to free rooms: if the best sets
+    over all rooms are free they are used as-is, otherwise the DP is run
+    again over the free rooms and kept in a small LRU cache.
+    """
+
+    def __init__(self, capacity, cache_size=256):
+        self.capacity = np.asarray(capacity, dtype=np.int64)
+        self.num_rooms = len(self.capacity)
+        self.cache_size = cache_size
+        self._table = _PackingTable(self.capacity, np.ones(self.num_rooms, dtype=bool))
+        self._free_tables = OrderedDict()
+
+    def best(self, needed, occupied=None):
+        """Room indices with the least spare capacity (then fewest rooms)
+        seating ``needed`` students"""
+        return self.options(needed, 1, occupied)[0]
+
+    def options(self, needed, count=5, occupied=None):
+        """Up to ``count`` room sets with the ``count`` smallest total
+        capacities that seat ``needed`` students, least waste first.
+
+        Every exam gets at least one room.  When even all free rooms are
+        too small, the only option is all of them (largest first); when
+        every room is occupied, occupancy is ignored.
+        """
+        needed = max(1, int(needed))
+        table = self._table
+        if occupied is not None and occupied.any():
+            if occupied.all():
+                occupied = None
+            else:
+                # The best sets over all rooms stay best if none of them is occupied
+                masks = table.masks(needed, count)
+                busy = np.packbits(occupied, bitorder='little')
+                if masks is None or any((mask & busy).any() for mask in masks):
+                    table = self._free_table(occupied)
+        return table.options(needed, count, self.capacity)
+
+    def room_masks(self, room_sets):
+        """Boolean room set x room matrix of room index lists"""
+        masks = np.zeros((len(room_sets), self.num_rooms), dtype=bool)
+        for s, rooms in enumerate(room_sets):
+            masks[s, rooms] = True
+        return masks
+
+    def _free_table(self, occupied):
+        key = occupied.tobytes()
+        table = self._free_tables.get(key)
+        if table is None:
+            table = _PackingTable(self.capacity, ~occupied)
+            self._free_tables[key] = table
+            if len(self._free_tables) > self.cache_size:
+                self._free_tables.popitem(last=False)
+        else:
+            self._free_tables.move_to_end(key)
+        return table
+
+
+class _PackingTable:
+    """Subset-sum DP over the ``usable`` rooms"""
+
+    def __init__(self, capacity, usable):
+        num_rooms = len(capacity)
+        total = int(capacity[usable].sum())
+        fewest = np.full(total + 1, num_rooms + 1, dtype=np.int64)
+        fewest[0] = 0
+        self.chosen = np.zeros((total + 1, (num_rooms + 7) // 8), dtype=np.uint8)
+
+        for room in np.flatnonzero(usable).tolist():
+            size = int(capacity[room])
+            if size <= 0:
+                continue
+            # Extend every total reachable without this room (0/1: read before writing)
+            candidate = fewest[:total + 1 - size] + 1
+            better = np.flatnonzero(candidate < fewest[size:])
+            if not len(better):
+                continue
+            targets = better + size
+            self.chosen[targets] = self.chosen[better]
+            self.chosen[targets, room >> 3] |= np.uint8(1 << (room & 7))
+            fewest[targets] = candidate[better]
+
+        self.num_rooms = num_rooms
+        self.usable = usable
+        self._rooms = {}  # total -> room list, decoded on first use
+        self.sums = np.flatnonzero(fewest <= num_rooms)
+        # first[n]: position in ``sums`` of the smallest reachable total >= n
+        self.first = np.searchsorted(self.sums, np.arange(total + 2))
+
+    def masks(self, needed, count):
+        """Packed room masks of the best ``count`` sets, or None if ``needed``
+        is more than all usable rooms hold"""
+        start = self.first[min(needed, len(self.first) - 1)]
+        if start >= len(self.sums):
+            return None
+        return [self.chosen[total] for total in self.sums[start:start + count]]
+
+    def options(self, needed, count, capacity):
+        start = self.first[min(needed, len(self.first) - 1)]
+        if start >= len(self.sums):
+            rooms = np.flatnonzero(self.usable)
+            return [rooms[np.argsort(-capacity[rooms], kind='stable')].tolist()]
+        return [list(self._room_list(total)) for total in self.sums[start:start + count].tolist()]
+
+    def _room_list(self, total):
+        rooms = self._rooms.get(total)
+        if rooms is None:
+            rooms = np.flatnonzero(np.unpackbits(self.chosen[total], bitorder='little')[:self.num_rooms]).tolist()
+            self._rooms[total] = rooms
+        return rooms
+
@@ -0,0 +1,89 @@
+import random
+
+import numpy as np
+
+from conflict_graph import DSatur
+from genome import Genome
+
+
+class Seeder:
+    """Builds near-feasible genomes for an initial population by graph colouring.
+
+    Exams are placed in DSatur order (most constrained first, random tie
+    breaks so every genome differs) on a consecutive same-day timeslot
+    window that none of their placed neighbours use and whose rooms are
+    still free, preferring weekdays and the least busy days, picked at
+    random among equally good windows.  Rooms are the free room set with
+    the least spare capacity (``RoomPacker``).
+
+    The timeslot windows of every exam length are computed once, when the
+    seeder is built.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        instance = engine.instance
+        self.num_slots = len(engine.time_slots)
+        self.enrollment = instance.enrollment.astype(np.int64)
+        self.required = np.maximum(1, instance.duration.astype(np.int64) // 120)  # 2 hours per slot
+        self.slot_day = engine.slot_day
+        self.slot_weekend = engine.slot_weekend
+
+        # Windows of consecutive slot indices within one day, per exam length;
+        # exams longer than any day fall back to single slots
+        self.windows = {}
+        for length in np.unique(self.required).tolist():
+            windows = [slots[i:i + length] for slots in engine.calendar.day_slots
+                       for i in range(len(slots) - length + 1)
+                       if slots[i + length - 1] - slots[i] == length - 1]
+            if not windows:
+                windows = [[t] for t in range(self.num_slots)]
+            self.windows[length] = np.array(windows, dtype=np.int64)
+
+        self.capacity = engine.capacity
+        self.room_packer = engine.room_packer
+
+    def genome(self):
+        """One seeded genome (uses the ``random`` module for tie breaks)"""
+        engine = self.engine
+        num_exams = engine.num_exams
+        dsatur = DSatur(engine.conflict_graph, self.num_slots)
+        dsatur.tie_break = dsatur.tie_break * num_exams + np.array(random.sample(range(num_exams), num_exams))
+
+        room_busy = np.zeros((self.num_slots, engine.num_rooms), dtype=bool)
+        day_load = np.zeros(engine.num_days, dtype=np.int64)
+        genome = Genome.empty(num_exams, engine.num_rooms)
+
+        exam = dsatur.next_exam()
+        while exam is not None:
+            slots, rooms = self.place(exam, dsatur.blocked[exam], room_busy, day_load)
+            genome.set_slots(exam, slots[0], len(slots))
+            genome.set_rooms(exam, rooms)
+            dsatur.place(exam, slots)
+            room_busy[np.ix_(slots, rooms)] = True
+            day_load[self.slot_day[slots[0]]] += 1
+            exam = dsatur.next_exam()
+        return genome
+
+    def place(self, exam, blocked, room_busy, day_load):
+        """``(slots, rooms)`` for one exam given the slots its placed
+        neighbours block and the rooms already booked per slot"""
+        windows = self.windows[int(self.required[exam])]
+        needed = int(self.enrollment[exam])
+
+        # Rooms free in every slot of each window and the seats they offer
+        room_free = ~room_busy[windows].any(axis=1)
+        seats = room_free @ self.capacity
+
+        # Lexicographic window cost: blocked slots, not enough seats,
+        # weekend, then how many exams the day already has
+        scale = int(day_load.max(initial=0)) + 1
+        cost = (blocked[windows].sum(axis=1) * 4 * scale
+                + (seats < needed) * 2 * scale
+                + self.slot_weekend[windows[:, 0]] * scale
+                + day_load[self.slot_day[windows[:, 0]]])
+        best = np.flatnonzero(cost == cost.min())
+        window = int(random.choice(best.tolist()))
+
+        rooms = self.room_packer.best(needed, occupied=~room_free[window])
+        return windows[window].tolist(), rooms
@@ -0,0 +1,128 @@
+from Time_Slots import Calendar, default_calendar
+from data import Data
+from fitness import FitnessCache, FitnessEngine
+from instance import Instance
+
+
+class Problem:
+    """Problem data, calendar and fitness engine, loaded the same way by
+    the solvers and ``repair.Rescheduler``"""
+
+    def __init__(self, students=None, exams=None, rooms=None, time_slots=None, instance=None):
+        # Columnar problem data (streamed from the CSVs unless objects or an
+        # instance are passed in); Exam/Room/Student objects are built lazily
+        if instance is None:
+            instance = Instance.from_objects(students, exams, rooms) if exams is not None else Data.load_instance()
+        self.instance = instance
+        self.calendar = Calendar.from_timeslots(time_slots if time_slots is not None else default_calendar())
+        self.time_slots = self.calendar.timeslots
+
+        # Shared vectorized scorer
+        self.fitness_engine = FitnessEngine.from_instance(self.instance, self.calendar)
+
+    @property
+    def students(self):
+        return self.instance.students
+
+    @property
+    def exams(self):
+        return self.instance.exams
+
+    @property
+    def rooms(self):
+        return self.instance.rooms
+
+
+class Solver(Problem):
+    """Problem data, scoring and conflict reporting shared by the GA, ACO
+    and simulated annealing solvers"""
+
+    def __init__(self, students=None, exams=None, rooms=None, time_slots=None, instance=None):
+        super().__init__(students, exams, rooms, time_slots, instance)
+
+        # Memoized fitness of already scored genomes (and recent conflict reports)
+        self.fitness_cache = FitnessCache(self.fitness_engine)
+
+        # Tracking conflict information
+        self.student_conflicts = []  # [(student_id, date, timeslot_id, exam1_id, exam2_id), ...]
+        self.room_conflicts = []     # [(room_id, date, timeslot_id, exam1_id, exam2_id), ...]
+        self.consecutive_exams = []  # [(student_id, date, [exam_ids]), ...]
+        self.capacity_issues = []    # [(exam_id, needed_capacity, available_capacity), ...]
+        self.non_consecutive_slots = [] # [(exam_id, [timeslot_ids]), ...]
+        self.conflict_stats = {}
+
+    def get_fitness(self, decoded_timetable, exams):
+        """Score a decoded timetable and record its conflicts for reporting"""
+        return self.record_conflicts(self.fitness_engine.conflict_report(decoded_timetable))
+
+    def record_conflicts(self, report):
+        """Keep the conflict lists of a report for print_conflict_report; returns its fitness"""
+        self.student_conflicts = report['student_conflicts']
+        self.room_conflicts = report['room_conflicts']
+        self.consecutive_exams = report['consecutive_exams']
+        self.capacity_issues = report['capacity_issues']
+        self.non_consecutive_slots = report['non_consecutive_slots']
+        self.conflict_stats = report['conflict_stats']
+        return report['fitness']  # Higher is better
+
+    def print_conflict_report(self):
+        """Print detailed information about conflicts in the schedule"""
+        print("\n====== CONFLICT REPORT ======")
+        print(f"Total Student Conflicts: {len(self.student_conflicts)}")
+        print(f"Total Room Conflicts: {len(self.room_conflicts)}")
+        print(f"Total Capacity Issues: {len(self.capacity_issues)}")
+        print(f"Students with Multiple Exams per Day: {len(self.consecutive_exams)}")
+        print(f"Non-consecutive Timeslot Issues: {len(self.non_consecutive_slots)}")
+
+        # Print all student conflicts
+        if self.student_conflicts:
+            print("\n----- STUDENT CONFLICTS -----")
+            for i, (student_id, date, timeslot_id, exam1, exam2) in enumerate(self.student_conflicts[:10], 1):
+                print(f"{i}. Student {student_id} has conflicting exams {exam1} and {exam2} on {date} at timeslot {timeslot_id}")
+
+            if len(self.student_conflicts) > 10:
+                print(f"... and {len(self.student_conflicts) - 10} more conflicts")
+
+            # Count conflicts per student
+            student_conflict_count = {}
+            for student_id, _, _, _, _ in self.student_conflicts:
+                student_conflict_count[student_id] = student_conflict_count.get(student_id, 0) + 1
+
+            # Print students with most conflicts
+            most_conflicted = sorted(student_conflict_count.items(), key=lambda x: x[1], reverse=True)[:5]
+            if most_conflicted:
+                print("\nStudents with most conflicts:")
+                for student_id, count in most_conflicted:
+                    print(f"Student {student_id}: {count} conflicts")
+
+        # Print room conflicts
+        if self.room_conflicts:
+            print("\n----- ROOM CONFLICTS -----")
+            for i, (room_id, date, timeslot_id, exam1, exam2) in enumerate(self.room_conflicts[:10], 1):
+                print(f"{i}. Room {room_id} double-booked for exams {exam1} and {exam2} on {date} at timeslot {timeslot_id}")
+
+            if len(self.room_conflicts) > 10:
+                print(f"... and {len(self.room_conflicts) - 10} more room conflicts")
+
+        # Print capacity issues
+        if self.capacity_issues:
+            print("\n----- CAPACITY ISSUES -----")
+            for i, (exam_id, needed, available) in enumerate(self.capacity_issues[:10], 1):
+                deficit = needed - available
+                print(f"{i}. Exam {exam_id} needs {needed} seats but only {available} available (deficit: {deficit})")
+
+            if len(self.capacity_issues) > 10:
+                print(f"... and {len(self.capacity_issues) - 10} more capacity issues")
+
+        # Print students with multiple exams in a day
+        if self.consecutive_exams:
+            print("\n----- MULTIPLE EXAMS PER DAY -----")
+            for i, (student_id, date, exams) in enumerate(self.consecutive_exams[:10], 1):
+                print(f"{i}. Student {student_id} has {len(exams)} exams on {date}: {', '.join(map(str, exams))}")
+
+            if len(self.consecutive_exams) > 10:
+                print(f"... and {len(self.consecutive_exams) - 10} more students with multiple exams per day")
+
+        print("\n==============================")
+
+        return self.conflict_stats
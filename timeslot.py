@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta
+from functools import cached_property
 
 class Timeslot:
     def __init__(self, timeslot_id: int, date: datetime, start_time: str, end_time: str):
@@ -7,11 +8,12 @@ class Timeslot:
         self.start_time = start_time
         self.end_time = end_time
         
-    @property
+    # Formatted once per timeslot; the date never changes after creation
+    @cached_property
     def day(self):
         return self.date.strftime("%A")
     
-    @property
+    @cached_property
     def date_str(self):
         return self.date.strftime("%Y-%m-%d")
     
@@ -9,8 +9,10 @@ from datetime import datetime
 import matplotlib.pyplot as plt
 import numpy as np
 from collections import defaultdict
+from instrumentation import timed
 import io
 
+@timed('pdf.daily_schedule')
 def generate_pdf_timetable(timetable, exams, rooms, filename="exam_schedule.pdf", conflict_data=None):
     """Generate a stylish PDF timetable with exam schedule and statistics."""
     doc = SimpleDocTemplate(filename, pagesize=letter)
@@ -369,18 +371,25 @@ def generate_pdf_timetable(timetable, exams, rooms, filename="exam_schedule.pdf"
     
     return filename
 
+@timed('plot.comparison')
 def visualize_comparison(results):
-    """Create visualizations comparing ACO and GA performance"""
+    """Create visualizations comparing the performance of the algorithms in
+    ``results`` ('aco', 'ga' and/or 'sa')"""
+    names = {'aco': 'ACO', 'ga': 'GA', 'sa': 'SA'}
+    colors = {'aco': '#3498db', 'ga': '#e74c3c', 'sa': '#2ecc71'}
+    keys = [key for key in names if key in results]
+    algorithms = [names[key] for key in keys]
+    bar_colors = [colors[key] for key in keys]
+    
     # Set up the figure with subplots
     fig = plt.figure(figsize=(15, 12))
-    fig.suptitle('ACO vs GA Algorithm Comparison for Exam Timetabling', fontsize=16)
+    fig.suptitle(f"{' vs '.join(algorithms)} Algorithm Comparison for Exam Timetabling", fontsize=16)
     
     # 1. Execution Time Comparison
     ax1 = fig.add_subplot(2, 2, 1)
-    algorithms = ['ACO', 'GA']
-    times = [results['aco']['execution_time'], results['ga']['execution_time']]
+    times = [results[key]['execution_time'] for key in keys]
     
-    ax1.bar(algorithms, times, color=['#3498db', '#e74c3c'])
+    ax1.bar(algorithms, times, color=bar_colors)
     ax1.set_title('Execution Time Comparison')
     ax1.set_ylabel('Time (seconds)')
     for i, v in enumerate(times):
@@ -389,9 +398,9 @@ def visualize_comparison(results):
     # 2. Fitness Comparison
     ax2 = fig.add_subplot(2, 2, 2)
     # Convert fitness values to positive for easier visualization
-    fitness_values = [abs(results['aco']['fitness']), abs(results['ga']['fitness'])]
+    fitness_values = [abs(results[key]['fitness']) for key in keys]
     
-    ax2.bar(algorithms, fitness_values, color=['#3498db', '#e74c3c'])
+    ax2.bar(algorithms, fitness_values, color=bar_colors)
     ax2.set_title('Fitness Comparison (Lower is Better)')
     ax2.set_ylabel('Penalty Points')
     for i, v in enumerate(fitness_values):
@@ -401,28 +410,24 @@ def visualize_comparison(results):
     ax3 = fig.add_subplot(2, 1, 2)
     conflict_types = ['Student\nConflicts', 'Room\nConflicts', 'Capacity\nIssues', 
                       'Multiple Exams\nPer Day', 'Non-consecutive\nTimeslots']
-    
-    aco_conflicts = [
-        results['aco']['conflicts']['student_conflicts'],
-        results['aco']['conflicts']['room_conflicts'],
-        results['aco']['conflicts']['capacity_issues'],
-        results['aco']['conflicts']['consecutive_exams'],
-        results['aco']['conflicts']['non_consecutive_slots']
-    ]
-    
-    ga_conflicts = [
-        results['ga']['conflicts']['student_conflicts'],
-        results['ga']['conflicts']['room_conflicts'],
-        results['ga']['conflicts']['capacity_issues'],
-        results['ga']['conflicts']['consecutive_exams'],
-        results['ga']['conflicts']['non_consecutive_slots']
-    ]
+    stats = ['student_conflicts', 'room_conflicts', 'capacity_issues', 'consecutive_exams', 'non_consecutive_slots']
     
     x = np.arange(len(conflict_types))
-    width = 0.35
+    width = 0.7 / len(keys)
     
-    rects1 = ax3.bar(x - width/2, aco_conflicts, width, label='ACO', color='#3498db')
-    rects2 = ax3.bar(x + width/2, ga_conflicts, width, label='GA', color='#e74c3c')
+    for k, key in enumerate(keys):
+        conflicts = [results[key]['conflicts'][stat] for stat in stats]
+        rects = ax3.bar(x + (k - (len(keys) - 1) / 2) * width, conflicts, width,
+                        label=names[key], color=colors[key])
+        
+        # Add labels to the bars
+        for rect in rects:
+            height = rect.get_height()
+            ax3.annotate(f'{height}',
+                        xy=(rect.get_x() + rect.get_width() / 2, height),
+                        xytext=(0, 3),  # 3 points vertical offset
+                        textcoords="offset points",
+                        ha='center', va='bottom')
     
     ax3.set_title('Conflict Comparison')
     ax3.set_ylabel('Number of Conflicts')
@@ -430,23 +435,6 @@ def visualize_comparison(results):
     ax3.set_xticklabels(conflict_types)
     ax3.legend()
     
-    # Add labels to the bars
-    for rect in rects1:
-        height = rect.get_height()
-        ax3.annotate(f'{height}',
-                    xy=(rect.get_x() + rect.get_width() / 2, height),
-                    xytext=(0, 3),  # 3 points vertical offset
-                    textcoords="offset points",
-                    ha='center', va='bottom')
-    
-    for rect in rects2:
-        height = rect.get_height()
-        ax3.annotate(f'{height}',
-                    xy=(rect.get_x() + rect.get_width() / 2, height),
-                    xytext=(0, 3),  # 3 points vertical offset
-                    textcoords="offset points",
-                    ha='center', va='bottom')
-    
     plt.tight_layout(rect=[0, 0, 1, 0.95])
     plt.savefig('algorithm_comparison.png', dpi=300)
     plt.savefig('algorithm_comparison.pdf')
@@ -9,7 +9,9 @@ from datetime import datetime
 import matplotlib.pyplot as plt
 import numpy as np
 from collections import defaultdict
+from instrumentation import timed
 
+@timed('pdf.entire_table')
 def generate_entire_timetable(timetable, exams, rooms, filename="exam_schedule.pdf"):
     """Generate a stylish PDF timetable with exam schedule and statistics."""
     doc = SimpleDocTemplate(filename, pagesize=letter)